@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+from utils import batch as bt, tictactoe as t
+from test_tictactoe import make_scripted_actions
+
+
+@pytest.mark.parametrize(
+    "board_size, win_length", ((3, None), (4, None), (5, 4), (7, 4))
+)
+def test_batch_agrees_with_scalar_engine(board_size, win_length):
+    n_games = 300
+    games = bt.simulate_random_games(n_games, board_size, win_length, seed=42)
+
+    assert not games.live.any()
+    assert (games.lengths == (games.moves >= 0).sum(axis=1)).all()
+
+    outcome = {"X": 1, "O": -1, None: 0}
+    for moves, length, winner in zip(games.moves, games.lengths, games.winners):
+        cells = [divmod(int(idx), board_size)[::-1] for idx in moves[:length]]
+        game = t.TicTacToe(
+            board_size,
+            *make_scripted_actions(cells, ("X", "O")),
+            win_length=win_length,
+        )
+        for _ in game.play(): pass
+
+        assert outcome[game.winner] == winner
+        assert board_size**2 - game.empty == length
+
+
+def test_batch_summary():
+    n_games = 1000
+    summary = bt.simulate_random_games(n_games, 3, seed=0).summary()
+
+    assert summary["first"] + summary["second"] + summary["draw"] == n_games
+    # the first player has the advantage in random play
+    assert summary["first"] > summary["second"]
+    assert 5 <= summary["mean_length"] <= 9
+
+
+def test_batch_step():
+    games = bt.BatchTicTacToe(2, 3)
+
+    with pytest.raises(ValueError):
+        games.step(np.array([0]))
+
+    games.step(np.array([0, 4]))
+    with pytest.raises(ValueError):
+        games.step(np.array([0, 1]))
+
+    assert games.boards[0, 0, 0] == 1 and games.boards[1, 1, 1] == 1
+    assert (games.lengths == 1).all()
@@ -0,0 +1,151 @@
+from time import perf_counter
+
+import pytest
+
+from utils import alphabeta as ab, bitboard as b, mcts as mc
+from utils import players as p, tictactoe as t
+
+
+def play_out(*players, board_size, win_length=None):
+    game = t.TicTacToe(
+        board_size, *players, engine=b.BitBoard, win_length=win_length
+    )
+    for _, state in game.play():
+        assert state
+    return game
+
+
+def test_unbound_player():
+    player = p.RandomPlayer("X", 3)
+    with pytest.raises(RuntimeError):
+        player()
+
+
+def test_random_player():
+    board_size = 4
+    marks = ("X", "O")
+    players = [p.RandomPlayer(mark, board_size, seed=i) for i, mark in enumerate(marks)]
+
+    # random players never make illegal moves
+    game = play_out(*players, board_size=board_size)
+    assert game.winner in marks or game.empty == 0
+
+
+def test_alphabeta_draws_itself():
+    board_size = 3
+    game = play_out(
+        ab.AlphaBetaPlayer("X", board_size), ab.AlphaBetaPlayer("O", board_size),
+        board_size=board_size,
+    )
+    assert game.winner is None
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_alphabeta_never_loses(seed):
+    board_size = 3
+
+    game = play_out(
+        ab.AlphaBetaPlayer("X", board_size),
+        p.RandomPlayer("O", board_size, seed=seed),
+        board_size=board_size,
+    )
+    assert game.winner != "O"
+
+    game = play_out(
+        p.RandomPlayer("X", board_size, seed=seed),
+        ab.AlphaBetaPlayer("O", board_size),
+        board_size=board_size,
+    )
+    assert game.winner != "X"
+
+
+def test_alphabeta_tactics():
+    board_size = 4
+    board = [None] * board_size**2
+
+    player = ab.AlphaBetaPlayer("X", board_size)
+    player.bind(board)
+
+    # the opponent threatens to complete the first row
+    for x in range(3): board[x] = "O"
+    board[5] = board[6] = "X"
+    assert player() == (3, 0, "X")
+
+    # own line is completed rather than the opponent's blocked
+    board[4] = "X"
+    assert player() == (3, 1, "X")
+
+
+def test_alphabeta_time_budget():
+    board_size, time_budget = 5, 0.05
+    board = [None] * board_size**2
+
+    player = ab.AlphaBetaPlayer("X", board_size, time_budget=time_budget)
+    player.bind(board)
+
+    start = perf_counter()
+    x, y, _ = player()
+    assert perf_counter() - start < time_budget * 10
+    assert board[y * board_size + x] is None
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_mcts_never_loses(seed):
+    board_size = 3
+
+    game = play_out(
+        mc.MCTSPlayer("X", board_size, iterations=2000, seed=seed),
+        p.RandomPlayer("O", board_size, seed=seed),
+        board_size=board_size,
+    )
+    assert game.winner != "O"
+
+
+def test_mcts_tactics():
+    board_size = 4
+    board = [None] * board_size**2
+
+    player = mc.MCTSPlayer("X", board_size, iterations=3000, seed=0)
+    player.bind(board)
+
+    # the opponent threatens to complete the first row
+    for x in range(3): board[x] = "O"
+    board[5] = board[6] = "X"
+    assert player() == (3, 0, "X")
+
+
+def test_mcts_tree_reuse():
+    board_size = 5
+    board = [None] * board_size**2
+
+    player = mc.MCTSPlayer("X", board_size, iterations=500, seed=0)
+    player.bind(board)
+
+    x, y, mark = player()
+    board[y * board_size + x] = mark
+    # the opponent answers with the move explored the most
+    answer = max(player.root.children, key=lambda child: child.visits)
+    board[answer.move] = "O"
+
+    visits = answer.visits
+    player()
+    assert player.root is not None
+    # the search started from the subtree grown during the last move
+    assert sum(child.visits for child in answer.children) >= visits - 1 + 500 - 1
+
+
+def test_mcts_parallel():
+    board_size = 7
+    board = [None] * board_size**2
+
+    with mc.MCTSPlayer(
+        "X", board_size, win_length=4, time_budget=0.05, workers=2, seed=0
+    ) as player:
+        player.bind(board)
+        x, y, mark = player()
+        assert player.pool is not None
+
+    assert mark == "X" and board[y * board_size + x] is None
+    assert player.root is None
+    # the workers are shut down on leaving the block
+    assert player.pool is None
@@ -0,0 +1,121 @@
+import pytest
+
+from utils import bitboard as b, players as p, records as r, tictactoe as t
+
+
+def play_random_games(writer, n_games, board_size, win_length=None):
+    games = []
+    for seed in range(n_games):
+        players = (
+            p.RandomPlayer("X", board_size, win_length, seed=seed),
+            p.RandomPlayer("O", board_size, win_length, seed=-seed),
+        )
+        game = t.TicTacToe(
+            board_size, *players, engine=b.BitBoard, win_length=win_length
+        )
+        steps = [(board.copy(), state) for board, state in writer.record(game)]
+        games.append((steps, game.winner))
+    return games
+
+
+def test_records_roundtrip(tmp_path):
+    path = str(tmp_path / "games.bin")
+    board_size, win_length, n_games = 5, 4, 50
+
+    with r.GameWriter(path, board_size, win_length) as writer:
+        games = play_random_games(writer, n_games, board_size, win_length)
+
+    with r.GameReader(path) as reader:
+        assert (reader.board_size, reader.win_length) == (board_size, win_length)
+        records = list(reader)
+        assert len(records) == len(reader) == n_games
+
+        for i, (record, (steps, winner)) in enumerate(zip(records, games)):
+            assert reader[i] == record
+            replayed = [
+                (board.copy(), state)
+                for board, state in r.replay(record, board_size, win_length)
+            ]
+            assert replayed == steps
+            assert record.result == (
+                r.DRAW if winner is None else r.FIRST if winner == "X" else r.SECOND
+            )
+
+        stats = r.game_stats(reader)
+        assert stats["games"] == n_games
+        assert stats["first"] + stats["second"] + stats["draw"] == n_games
+        assert stats["mean_length"] == sum(map(len, records)) / n_games
+
+        openings = r.opening_frequencies(reader)
+        assert sum(openings.values()) == n_games
+        assert all(len(opening) == 1 for opening in openings)
+
+
+def test_records_append(tmp_path):
+    path = str(tmp_path / "games.bin")
+
+    with r.GameWriter(path, 3) as writer:
+        writer.write([0, 4, 8], r.FIRST)
+    with r.GameWriter(path, 3) as writer:
+        writer.write([4, 0, 2, 6, 3, 5, 1, 7, 8], r.DRAW)
+
+    with pytest.raises(ValueError):
+        r.GameWriter(path, 4)
+
+    with r.GameReader(path) as reader:
+        assert len(reader) == 2
+        assert reader[1].moves == bytes([4, 0, 2, 6, 3, 5, 1, 7, 8])
+
+    # the index is rebuilt by scanning the records if it is lost
+    (tmp_path / ("games.bin" + r.INDEX_SUFFIX)).unlink()
+    with r.GameReader(path) as reader:
+        assert len(reader) == 2
+        assert reader[0] == r.GameRecord(bytes([0, 4, 8]), r.FIRST)
+
+
+def test_records_append_lost_index(tmp_path):
+    path = str(tmp_path / "games.bin")
+    index = tmp_path / ("games.bin" + r.INDEX_SUFFIX)
+    games = [
+        ([0, 4, 8], r.FIRST),
+        ([4, 0, 2, 6, 3, 5, 1, 7, 8], r.DRAW),
+        ([1, 0, 4, 3, 7], r.FIRST),
+    ]
+
+    with r.GameWriter(path, 3) as writer:
+        for moves, result in games[:2]:
+            writer.write(moves, result)
+
+    # the index is lost before the next game is appended
+    index.unlink()
+    with r.GameWriter(path, 3) as writer:
+        writer.write(*games[2])
+
+    expected = [r.GameRecord(bytes(moves), result) for moves, result in games]
+    with r.GameReader(path) as reader:
+        assert len(reader) == 3
+        assert list(reader) == expected
+        assert [reader[i] for i in range(3)] == expected
+
+    # the tail of the index is lost (along with a half-written entry)
+    index.write_bytes(index.read_bytes()[:-12])
+    with r.GameWriter(path, 3) as writer:
+        writer.write(*games[0])
+    with r.GameReader(path) as reader:
+        assert len(reader) == 4
+        assert [reader[i] for i in range(4)] == expected + expected[:1]
+
+    # the reader does not trust the index which misses the first records
+    index.write_bytes(index.read_bytes()[8:])
+    with r.GameReader(path) as reader:
+        assert len(reader) == 4
+        assert reader[0] == expected[0]
+
+
+def test_records_bad_file(tmp_path):
+    path = tmp_path / "garbage.bin"
+    path.write_bytes(b"garbage")
+    with pytest.raises(ValueError):
+        r.GameReader(str(path))
+    with pytest.raises(ValueError):
+        r.GameWriter(str(tmp_path / "big.bin"), 17)
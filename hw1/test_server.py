@@ -0,0 +1,119 @@
+import asyncio
+
+from utils import server as s
+
+
+async def connect(port):
+    return await asyncio.open_connection("127.0.0.1", port)
+
+
+async def play(reader, writer, moves):
+    '''
+    Answer each prompt with the next move,
+    returns all the lines received
+    '''
+    moves = iter(moves)
+    lines = []
+    while True:
+        line = (await reader.readline()).decode()
+        if not line: return lines
+        lines.append(line.strip())
+        if line == "MOVE\n":
+            writer.write(f"{next(moves)}\n".encode())
+            await writer.drain()
+
+
+async def run_game(port, first_moves, second_moves):
+    first = await connect(port)
+    second = await connect(port)
+    return await asyncio.gather(play(*first, first_moves), play(*second, second_moves))
+
+
+def test_format_board():
+    board = ["X", None, "O", None]
+    assert s.format_board(board, 2) == "X |  \nO |  \n"
+
+
+def test_game_session():
+    async def scenario():
+        game_server = s.GameServer()
+        server = await game_server.start()
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            result = await run_game(
+                port, ("0:0", "bad", "1:1", "2:2"), ("0:1", "0:1", "0:2")
+            )
+        return game_server, result
+
+    game_server, (first, second) = asyncio.run(scenario())
+
+    assert first[0] == "WAITING" and "WELCOME X" in first
+    assert "WELCOME O" in second
+    assert first[-1] == second[-1] == "WINNER X"
+    assert first.count("BAD INPUT") == 1 and second.count("BAD INPUT") == 1
+    assert game_server.played == 1 and game_server.active == 0
+
+
+def test_opponent_left():
+    async def scenario():
+        server = await s.GameServer().start()
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            first = await connect(port)
+            reader, writer = await connect(port)
+            writer.close()
+            return await play(*first, ("0:0", "1:1"))
+
+    lines = asyncio.run(scenario())
+    assert lines[-1] == "OPPONENT LEFT"
+
+
+def test_left_while_waiting():
+    async def scenario():
+        game_server = s.GameServer()
+        server = await game_server.start()
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            reader, writer = await connect(port)
+            assert await reader.readline() == b"WAITING\n"
+            writer.close()
+            await writer.wait_closed()
+            # the server notices the player has left
+            for _ in range(100):
+                if not game_server.lobby: break
+                await asyncio.sleep(0.01)
+            assert not game_server.lobby
+            result = await run_game(
+                port, ("0:0", "1:0", "2:0"), ("0:1", "1:1", "2:1")
+            )
+        return game_server, result
+
+    game_server, (first, second) = asyncio.run(scenario())
+
+    assert first[0] == "WAITING" and "WELCOME X" in first
+    assert first[-1] == second[-1] == "WINNER X"
+    assert game_server.played == 1 and not game_server.lobby
+
+
+def test_concurrent_sessions():
+    n_games = 200
+    moves = ("0:0", "1:0", "2:0"), ("0:1", "1:1", "2:1")
+
+    async def scenario():
+        game_server = s.GameServer()
+        server = await game_server.start()
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            # the clients of each game connect one after another
+            games = []
+            for _ in range(n_games):
+                first, second = await connect(port), await connect(port)
+                games.append(play(*first, moves[0]))
+                games.append(play(*second, moves[1]))
+            results = await asyncio.gather(*games)
+        return game_server, results
+
+    game_server, results = asyncio.run(scenario())
+
+    assert game_server.played == n_games
+    assert all(lines[-1] == "WINNER X" for lines in results)
@@ -0,0 +1,84 @@
+import pytest
+
+from utils import alphabeta as ab, players as p, tablebase as tb
+from test_players import play_out
+
+
+@pytest.fixture(scope="module")
+def make_tablebase(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp("tablebase") / "3x3.bin")
+    count = tb.write_tablebase(path, 3)
+    return path, count
+
+
+def test_symmetries():
+    board_size = 3
+    perms = tb.symmetries(board_size)
+    assert len(set(perms)) == 8
+    for perm in perms:
+        assert sorted(perm) == list(range(board_size**2))
+
+    # the corner openings are the same position
+    corners = (0, 2, 6, 8)
+    keys = set()
+    for corner in corners:
+        cells = [0] * board_size**2
+        cells[corner] = 1
+        keys.add(tb.canonical_key(cells, board_size)[0])
+    assert len(keys) == 1
+
+
+def test_tablebase_lookup(make_tablebase):
+    path, count = make_tablebase
+    tablebase = tb.Tablebase(path)
+    assert len(tablebase) == count
+
+    # the empty board is a draw
+    value, move = tablebase.lookup([0] * 9)
+    assert value == 0 and 0 <= move < 9
+
+    # the first player completes the top row in any orientation
+    for perm in tb.symmetries(3):
+        board = [1, 1, 0, 2, 2, 0, 0, 0, 0]
+        cells = [board[perm.index(i)] for i in range(9)]
+        value, move = tablebase.lookup(cells)
+        assert value == 1 and move == perm[2]
+
+    # both players have the same number of marks
+    # after the second one moves, thus this one is not reachable
+    assert tablebase.lookup([2, 0, 0, 0, 0, 0, 0, 0, 0]) is None
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_tablebase_player(make_tablebase, seed):
+    path, _ = make_tablebase
+    board_size = 3
+
+    game = play_out(
+        tb.TablebasePlayer("X", board_size, path=path),
+        p.RandomPlayer("O", board_size, seed=seed),
+        board_size=board_size,
+    )
+    assert game.winner != "O"
+
+    game = play_out(
+        p.RandomPlayer("X", board_size, seed=seed),
+        tb.TablebasePlayer("O", board_size, path=path),
+        board_size=board_size,
+    )
+    assert game.winner != "X"
+
+    game = play_out(
+        ab.AlphaBetaPlayer("X", board_size),
+        tb.TablebasePlayer("O", board_size, path=path),
+        board_size=board_size,
+    )
+    assert game.winner is None
+
+
+def test_tablebase_player_args(make_tablebase):
+    path, _ = make_tablebase
+    with pytest.raises(TypeError):
+        tb.TablebasePlayer("X", 3)
+    with pytest.raises(ValueError):
+        tb.TablebasePlayer("X", 4, path=path)
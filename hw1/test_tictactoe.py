@@ -1,8 +1,9 @@
 from io import StringIO
+from random import Random
 
 import pytest
 
-from utils import console as c, tictactoe as t, io as io
+from utils import console as c, tictactoe as t, io as io, bitboard as b
 
 
 @pytest.fixture
@@ -143,3 +144,93 @@ def test_PlayTicTacToe(make_buffers, make_factory_params):
 
     assert started
     assert not finished
+
+
+def make_scripted_actions(moves, marks):
+    # the players take turns, each one pops
+    # the next move from the shared script
+    script = iter(moves)
+
+    def action_factory(mark):
+        def action():
+            x, y = next(script)
+            return x, y, mark
+        return action
+
+    return tuple(map(action_factory, marks))
+
+
+@pytest.mark.parametrize(
+    "board_size, win_length", ((3, None), (4, None), (5, None), (6, 4), (9, 5))
+)
+def test_bitboard_engine(board_size, win_length):
+    rng = Random(board_size)
+    marks = ("X", "O")
+
+    for _ in range(200):
+        cells = [divmod(i, board_size)[::-1] for i in range(board_size**2)]
+        rng.shuffle(cells)
+
+        plain = t.TicTacToe(
+            board_size,
+            *make_scripted_actions(cells, marks),
+            win_length=win_length,
+        )
+        fast = t.TicTacToe(
+            board_size,
+            *make_scripted_actions(cells, marks),
+            engine=b.BitBoard,
+            win_length=win_length,
+        )
+
+        # boards are copied as the same list is yielded on every step
+        plain_steps = [(board.copy(), state) for board, state in plain.play()]
+        fast_steps = [(board.copy(), state) for board, state in fast.play()]
+
+        assert plain_steps == fast_steps
+
+        assert plain.winner == fast.winner
+        assert fast.engine.empty == fast.board.count(None)
+
+
+def test_bitboard_bad_moves():
+    board_size = 3
+    moves = ((0, 0), (0, 0), (5, 5), (-1, 0), (1, 0), (0, 1), (1, 1), (0, 2))
+    game = t.TicTacToe(
+        board_size, *make_scripted_actions(moves, ("X", "O")), engine=b.BitBoard
+    )
+    states = [state for _, state in game.play()]
+
+    # the first yield is the initial board
+    assert states == [True, True, False, False, False, True, True, True, True]
+    assert game.winner == "X"
+
+
+@pytest.mark.parametrize("engine", (None, b.BitBoard))
+def test_win_length(engine):
+    board_size, win_length = 15, 5
+    # X builds a diagonal in the middle of the board,
+    # O plays along the top row far from it
+    moves = []
+    for i in range(win_length):
+        moves.extend(((5 + i, 9 - i), (2 * i, 0)))
+
+    game = t.TicTacToe(
+        board_size,
+        *make_scripted_actions(moves, ("X", "O")),
+        engine=engine,
+        win_length=win_length,
+    )
+    for _ in game.play(): pass
+
+    assert game.winner == "X"
+    assert game.empty == board_size**2 - 2 * win_length + 1
+
+
+def test_win_length_validation():
+    with pytest.raises(TypeError):
+        t.TicTacToe(3, win_length=2.5)
+
+    for win_length in (0, 4):
+        with pytest.raises(ValueError):
+            t.TicTacToe(3, win_length=win_length)
@@ -0,0 +1,37 @@
+from functools import partial
+
+import pytest
+
+from utils import alphabeta as ab, players as p, tournament as tr
+
+
+@pytest.fixture
+def make_factories():
+    return {
+        "random": p.RandomPlayer,
+        "alphabeta": partial(ab.AlphaBetaPlayer, time_budget=0.01),
+    }
+
+
+@pytest.mark.parametrize("workers", (0, 2))
+def test_round_robin(make_factories, workers):
+    n_games = 6
+    result = tr.round_robin(make_factories, n_games, workers=workers, chunk_size=4)
+
+    assert set(result.table) == {("random", "alphabeta"), ("alphabeta", "random")}
+    for outcomes in result.table.values():
+        assert sum(outcomes.values()) == n_games
+
+    standings = result.standings()
+    assert standings["alphabeta"]["loss"] == 0
+    assert sum(standings["random"].values()) == 2 * n_games
+
+    table = result.format_table()
+    assert "alphabeta" in table and "random" in table
+
+
+def test_round_robin_bad_args(make_factories):
+    with pytest.raises(ValueError):
+        tr.round_robin(make_factories, -1)
+    with pytest.raises(ValueError):
+        tr.round_robin(make_factories, 10, chunk_size=0)
@@ -0,0 +1,181 @@
+from itertools import chain
+from random import Random
+from time import perf_counter
+from typing import Dict, Hashable, List, Optional, Tuple
+
+from .bitboard import win_masks
+from .players import BoardPlayer
+
+# kinds of the values stored in the transposition table
+EXACT, LOWER, UPPER = 0, 1, 2
+
+
+class SearchTimeout(Exception):
+    pass
+
+
+class AlphaBetaPlayer(BoardPlayer):
+    '''
+    Search-based player: negamax with alpha-beta pruning
+    over the bitboard representation of the position
+
+    + the positions are hashed with Zobrist keys, which are updated
+      incrementally as the moves are made, and the results are kept
+      in the transposition table between the moves
+    + the move from the table (if any) is searched first, then the cells
+      with more winning lines passing through them
+    + the search is iteratively deepened until the time budget runs out,
+      the move found by the last completed iteration is played
+
+    Arguments: same as for `BoardPlayer`, and
+
+    + `time_budget`: float (default 0.1), seconds per move
+    + `max_depth`: int (optional), the depth limit (in plies)
+    + `seed`: (default 0), the seed for Zobrist keys
+    + `table_size`: int, the transposition table is cleared once
+      it holds more entries than that
+    '''
+
+    # the score of a won position, faster wins are preferred
+    # as the number of the empty cells left is added to it
+    WIN = 1_000_000
+
+    def __init__(
+        self,
+        mark: Hashable,
+        board_size: int,
+        win_length: Optional[int] = None,
+        time_budget: float = 0.1,
+        max_depth: Optional[int] = None,
+        seed=0,
+        table_size: int = 1 << 20,
+    ) -> None:
+        super().__init__(mark, board_size, win_length)
+        self.time_budget = time_budget
+        self.max_depth = max_depth
+        self.table_size = table_size
+
+        cells = board_size**2
+        rng = Random(seed)
+        self.zobrist = tuple(
+            tuple(rng.getrandbits(64) for _ in range(cells)) for _ in range(2)
+        )
+        self.side_key = rng.getrandbits(64)
+
+        self.lines = win_masks(board_size, self.win_length)
+        self.all_lines = tuple(set(chain.from_iterable(self.lines)))
+        self.order = sorted(range(cells), key=lambda idx: -len(self.lines[idx]))
+
+        self.table: Dict[int, Tuple[int, int, int, Optional[int]]] = {}
+        self.deadline = float('inf')
+        self.nodes = 0
+
+    def choose(self, board: List[Optional[Hashable]]) -> int:
+        # the player to move is always 0, the opponent is 1
+        masks, key, empty = [0, 0], 0, 0
+        for idx, cell in enumerate(board):
+            if cell is None:
+                empty += 1
+                continue
+            side = 0 if cell == self.mark else 1
+            masks[side] |= 1 << idx
+            key ^= self.zobrist[side][idx]
+
+        if len(self.table) > self.table_size: self.table.clear()
+
+        occupied = masks[0] | masks[1]
+        best_move = next(idx for idx in self.order if not occupied >> idx & 1)
+        max_depth = empty if self.max_depth is None else min(empty, self.max_depth)
+
+        deadline = perf_counter() + self.time_budget
+        for depth in range(1, max_depth + 1):
+            # the first iteration is always completed
+            self.deadline = float('inf') if depth == 1 else deadline
+            try:
+                value = self._search(
+                    masks, 0, key, empty, depth, -self.WIN * 2, self.WIN * 2
+                )
+            except SearchTimeout:
+                break
+            best_move = self.table[key][3]
+            # the game is solved, no need to search deeper
+            if abs(value) >= self.WIN: break
+
+        return best_move
+
+    def _moves(self, occupied: int, first: Optional[int]):
+        if first is not None: yield first
+        for idx in self.order:
+            if idx != first and not occupied >> idx & 1: yield idx
+
+    def _evaluate(self, masks: List[int], side: int) -> int:
+        # the lines which are still open for a single player
+        # add up to the score of this player
+        own, other = masks[side], masks[1 - side]
+        score = 0
+        for line in self.all_lines:
+            if not line & other: score += bin(line & own).count('1') ** 2
+            elif not line & own: score -= bin(line & other).count('1') ** 2
+        return score
+
+    def _search(
+        self,
+        masks: List[int],
+        side: int,
+        key: int,
+        empty: int,
+        depth: int,
+        alpha: int,
+        beta: int,
+    ) -> int:
+        '''
+        Negamax search of the position where `side` is to move
+        Returns: the score from the perspective of `side`
+        '''
+        self.nodes += 1
+        if not self.nodes & 1023 and perf_counter() > self.deadline:
+            raise SearchTimeout
+
+        original_alpha = alpha
+        table_move = None
+        entry = self.table.get(key)
+        if entry is not None:
+            entry_depth, kind, value, table_move = entry
+            if entry_depth >= depth:
+                if kind == EXACT: return value
+                if kind == LOWER: alpha = max(alpha, value)
+                else: beta = min(beta, value)
+                if alpha >= beta: return value
+
+        if depth == 0: return self._evaluate(masks, side)
+
+        best_value, best_move = -self.WIN * 2, None
+        zobrist, occupied = self.zobrist[side], masks[0] | masks[1]
+
+        for idx in self._moves(occupied, table_move):
+            own = masks[side] | 1 << idx
+            if any(own & line == line for line in self.lines[idx]):
+                value = self.WIN + empty - 1
+            elif empty == 1:
+                value = 0
+            else:
+                child = [own, masks[1]] if side == 0 else [masks[0], own]
+                value = -self._search(
+                    child,
+                    1 - side,
+                    key ^ zobrist[idx] ^ self.side_key,
+                    empty - 1,
+                    depth - 1,
+                    -beta,
+                    -alpha,
+                )
+
+            if value > best_value: best_value, best_move = value, idx
+            alpha = max(alpha, value)
+            if alpha >= beta: break
+
+        if best_value <= original_alpha: kind = UPPER
+        elif best_value >= beta: kind = LOWER
+        else: kind = EXACT
+        self.table[key] = (depth, kind, best_value, best_move)
+        return best_value
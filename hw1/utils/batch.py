@@ -0,0 +1,136 @@
+from typing import Dict, Optional
+
+import numpy as np
+
+
+class BatchTicTacToe:
+    '''
+    Many games of Tic-tac-toe played at once: the boards are
+    held as `(n_games, board_size, board_size)` array, the first
+    player's marks are `1` and the second player's ones are `-1`
+
+    On each step, one move is applied to every game which is still
+    being played, then the wins are checked for all of them at once
+    via the sums over every line of `win_length` cells. The rules
+    are the same as for `TicTacToe`: the players take turns, the first
+    one moves first, and the game ends once a line is completed
+    or the board is full
+
+    Arguments:
+
+    + `n_games`: int, the number of games
+    + `board_size`: int, the board size
+    + `win_length`: int (optional), the number of marks in a row
+      needed to win, defaults to the board size
+
+    After the games are over, the results are found in
+    + `winners`: 1 or -1 for the winning player, 0 for a draw
+    + `lengths`: the number of moves made in each game
+    + `moves`: the indices of the cells (`y * board_size + x`)
+      in the order they were taken, padded with -1
+    '''
+
+    def __init__(
+        self, n_games: int, board_size: int, win_length: Optional[int] = None
+    ) -> None:
+        if not isinstance(n_games, int) or not isinstance(board_size, int):
+            raise TypeError(f"Expected integer number of games and board size")
+        win_length = board_size if win_length is None else win_length
+        if not 0 < win_length <= board_size:
+            raise ValueError(f"Win length should be in [1, {board_size}]")
+
+        self.board_size = board_size
+        self.win_length = win_length
+        self.boards = np.zeros((n_games, board_size, board_size), dtype=np.int8)
+        self.winners = np.zeros(n_games, dtype=np.int8)
+        self.lengths = np.zeros(n_games, dtype=np.int16)
+        self.moves = np.full((n_games, board_size**2), -1, dtype=np.int16)
+        self.live = np.ones(n_games, dtype=bool)
+        self.player = 1
+
+    @property
+    def cells(self) -> np.ndarray:
+        # flat view of the boards
+        return self.boards.reshape(len(self.boards), -1)
+
+    def step(self, cells: np.ndarray) -> None:
+        '''
+        Make a move in every live game (all of them are made
+        by the same player as the games are played in lockstep)
+
+        Arguments:
+            `cells`: array of the cell indices, one per live game
+        Raises:
+            `ValueError` if any of the cells is occupied
+        '''
+        games = np.flatnonzero(self.live)
+        cells = np.asarray(cells)
+        if cells.shape != games.shape:
+            raise ValueError(f"Expected {len(games)} moves, got {cells.shape}")
+
+        flat = self.cells
+        if flat[games, cells].any(): raise ValueError(f"Cells are occupied")
+
+        flat[games, cells] = self.player
+        self.moves[games, self.lengths[games]] = cells
+        self.lengths[games] += 1
+
+        won = self._wins(self.boards[games] == self.player)
+        full = self.lengths[games] == self.board_size**2
+        self.winners[games[won]] = self.player
+        self.live[games[won | full]] = False
+        self.player = -self.player
+
+    def _wins(self, marks: np.ndarray) -> np.ndarray:
+        '''
+        Sum the marks over every line of `win_length` cells
+        (slices of the boards shifted along the line direction
+        are added up), the line is completed if the sum is `win_length`
+        '''
+        k = self.win_length
+        span = self.board_size - k + 1
+        marks = marks.view(np.int8)
+
+        rows = sum(marks[:, :, i : span + i] for i in range(k))
+        cols = sum(marks[:, i : span + i, :] for i in range(k))
+        diag = sum(marks[:, i : span + i, i : span + i] for i in range(k))
+        anti_diag = sum(
+            marks[:, i : span + i, k - 1 - i : span + k - 1 - i] for i in range(k)
+        )
+
+        return np.logical_or.reduce(
+            [(lines == k).any(axis=(1, 2)) for lines in (rows, cols, diag, anti_diag)]
+        )
+
+    def summary(self) -> Dict[str, float]:
+        return dict(
+            first=int((self.winners == 1).sum()),
+            second=int((self.winners == -1).sum()),
+            draw=int((self.winners == 0).sum()),
+            mean_length=float(self.lengths.mean()) if len(self.lengths) else 0.0,
+        )
+
+
+def simulate_random_games(
+    n_games: int,
+    board_size: int,
+    win_length: Optional[int] = None,
+    seed=None,
+) -> BatchTicTacToe:
+    '''
+    Play `n_games` games where both players put their marks
+    onto uniformly random empty cells
+
+    Returns: `BatchTicTacToe` with finished games
+    '''
+    games = BatchTicTacToe(n_games, board_size, win_length)
+    rng = np.random.default_rng(seed)
+
+    while games.live.any():
+        boards = games.cells[games.live]
+        # the empty cell with the largest random score is taken
+        scores = rng.random(boards.shape)
+        scores[boards != 0] = -1
+        games.step(scores.argmax(axis=1))
+
+    return games
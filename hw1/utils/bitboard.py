@@ -0,0 +1,85 @@
+from functools import lru_cache
+from typing import Dict, Hashable, List, Optional, Tuple
+
+
+@lru_cache(maxsize=None)
+def win_masks(board_size: int, win_length: int) -> Tuple[Tuple[int, ...], ...]:
+    '''
+    Precompute the winning lines of the board as bitmasks
+
+    Returns: tuple with an entry for every cell of the board,
+    each entry holds the masks of all the segments of `win_length`
+    cells (horizontal, vertical or diagonal) passing through this cell
+    '''
+    directions = ((1, 0), (0, 1), (1, 1), (1, -1))
+    inside = lambda x, y: 0 <= x < board_size and 0 <= y < board_size
+
+    masks = []
+    for idx in range(board_size**2):
+        y, x = divmod(idx, board_size)
+        lines = []
+        for dx, dy in directions:
+            # the segment may start up to `win_length - 1`
+            # cells before the current one
+            for shift in range(1 - win_length, 1):
+                cells = [
+                    (x + (shift + i) * dx, y + (shift + i) * dy)
+                    for i in range(win_length)
+                ]
+                if not all(inside(xx, yy) for xx, yy in cells): continue
+                lines.append(sum(1 << (yy * board_size + xx) for xx, yy in cells))
+        masks.append(tuple(lines))
+    return tuple(masks)
+
+
+class BitBoard:
+    '''
+    Board engine which stores the marks of each player
+    as an integer bitmask (bit `idx` is set if the cell
+    `idx` is occupied by the player)
+
+    Only the lines passing through the last move are checked
+    against the precomputed masks and the number of empty cells
+    is tracked along the way, thus the cost of a move only depends
+    on the win length
+
+    Arguments:
+
+    + `board_size`: int, the board size
+    + `win_length`: int (optional), the number of marks in a row
+      needed to win, defaults to the board size
+    '''
+
+    def __init__(self, board_size: int, win_length: Optional[int] = None) -> None:
+        self.board_size = board_size
+        self.win_length = board_size if win_length is None else win_length
+        # plain list is still kept in sync as `TicTacToe`
+        # yields it to the callbacks
+        self.board: List[Optional[Hashable]] = [None] * board_size**2
+        self.masks: Dict[Hashable, int] = {}
+        self.empty = board_size**2
+        self.lines = win_masks(board_size, self.win_length)
+
+    def place(self, idx: int, mark: Hashable) -> bool:
+        '''
+        Put the mark onto the cell `idx`
+
+        Returns: `False` if the cell is already occupied
+        Raises: `IndexError` if the cell is out of the board
+        '''
+        if self.board[idx] is not None: return False
+        self.board[idx] = mark
+        self.masks[mark] = self.masks.get(mark, 0) | 1 << idx
+        self.empty -= 1
+        return True
+
+    def winner(self, idx: int) -> Optional[Hashable]:
+        '''
+        Check the lines passing through the cell `idx`
+        Returns: the mark on this cell if it completes any line, `None` otherwise
+        '''
+        mark = self.board[idx]
+        if mark is None: return None
+        mask = self.masks[mark]
+        for line in self.lines[idx]:
+            if mask & line == line: return mark
@@ -20,16 +20,24 @@ def default_user_action_factory(
 
     def default_action():
         out_stream.write(prompt)
-        # this implementation does not raise, thus
-        # if there is an incorrect input, the user will be prompted
-        # to input again
-        try: x, y = map(int, in_stream.readline().split(delim))
-        except ValueError: return -1, -1, mark
-        else: return x, y, mark
+        return parse_move(in_stream.readline(), delim, mark)
 
     return default_action
 
 
+def parse_move(line: str, delim: str, mark):
+    '''
+    Parse the coordinates given by the user
+    (X and Y separated by the delimeter)
+    '''
+    # this implementation does not raise, thus
+    # if there is an incorrect input, the user will be prompted
+    # to input again
+    try: x, y = map(int, line.split(delim))
+    except ValueError: return -1, -1, mark
+    else: return x, y, mark
+
+
 def default_error_handler(state):
     # default error handler will raise an exception
     # and the game loop will abort
@@ -46,6 +54,8 @@ def PlayTicTacToe(
     on_action=None,
     prompts=None,
     delim: str = ':',
+    engine=None,
+    win_length=None,
 ):
     if prompts is None and on_action is None:
         raise TypeError(f'Should provide a set of either prompts or actions')
@@ -59,7 +69,9 @@ def PlayTicTacToe(
         else on_action
     )
 
-    game = TicTacToe(board_size, *actions)
+    game = TicTacToe(
+        board_size, *actions, engine=engine, win_length=win_length
+    )
     on_start()
 
     for board, state in game.play():
@@ -0,0 +1,254 @@
+from concurrent.futures import ProcessPoolExecutor
+from math import log, sqrt
+from random import Random
+from time import perf_counter
+from typing import Dict, Hashable, List, Optional
+
+from .bitboard import win_masks
+from .players import BoardPlayer
+
+# the result of the game which nobody won
+DRAW = -1
+
+
+class Node:
+    '''
+    Node of the search tree: the position after `move`,
+    the statistics are kept for the player who made the move
+    '''
+
+    __slots__ = (
+        'move', 'parent', 'children', 'untried', 'wins', 'visits', 'winner'
+    )
+
+    def __init__(
+        self,
+        move: Optional[int],
+        parent: Optional['Node'],
+        untried: List[int],
+        winner: Optional[int] = None,
+    ) -> None:
+        self.move = move
+        self.parent = parent
+        self.children: List['Node'] = []
+        self.untried = untried
+        self.wins = 0.0
+        self.visits = 0
+        # the side which won (or `DRAW`) if the game is over
+        self.winner = winner
+
+
+class MCTSPlayer(BoardPlayer):
+    '''
+    Monte Carlo tree search (UCT) player, suitable for the large boards
+    where the exhaustive search is out of reach
+
+    The tree is kept between the moves: once the opponent answers,
+    the subtree of the answer becomes the new root. If `workers` are given,
+    the search is root-parallel: each process grows its own tree from
+    the current position and the visit counts of the moves are summed up
+
+    Arguments: same as for `BoardPlayer`, and
+
+    + `time_budget`: float (default 0.1), seconds per move
+    + `iterations`: int (optional), the number of iterations per move
+      (per process), the search stops on whichever budget runs out first
+    + `exploration`: float, UCT exploration constant
+    + `workers`: int (default 0), the number of processes for the search,
+      if 0, the search runs in the current process
+    + `seed`: (optional), the seed for the random generator
+
+    The pool of the workers is started on the first move and kept between
+    the moves, it is shut down by `close` (or by leaving the `with` block)
+    '''
+
+    def __init__(
+        self,
+        mark: Hashable,
+        board_size: int,
+        win_length: Optional[int] = None,
+        time_budget: float = 0.1,
+        iterations: Optional[int] = None,
+        exploration: float = 1.4,
+        workers: int = 0,
+        seed=None,
+    ) -> None:
+        super().__init__(mark, board_size, win_length)
+        self.time_budget = time_budget
+        self.iterations = iterations
+        self.exploration = exploration
+        self.workers = workers
+        self.seed = seed
+        self.rng = Random(seed)
+        self.lines = win_masks(board_size, self.win_length)
+        self.cells = board_size**2
+        self.full = (1 << self.cells) - 1
+
+        # the tree left after the last move and the position it is rooted at
+        self.root: Optional[Node] = None
+        self.masks: Optional[List[int]] = None
+        self.pool: Optional[ProcessPoolExecutor] = None
+
+    def __enter__(self) -> 'MCTSPlayer':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self.pool is not None: self.pool.shutdown()
+        self.pool = None
+
+    def choose(self, board: List[Optional[Hashable]]) -> int:
+        # the player to move is always 0, the opponent is 1
+        masks = [0, 0]
+        for idx, cell in enumerate(board):
+            if cell is None: continue
+            masks[0 if cell == self.mark else 1] |= 1 << idx
+
+        if self.workers:
+            visits = self._parallel_visits(masks)
+            self.root = None
+        else:
+            root = self._reuse(masks) or self._new_root(masks)
+            self.search(root, masks)
+            visits = {child.move: child.visits for child in root.children}
+
+        move = max(visits, key=visits.get)
+
+        if not self.workers:
+            self.root = next(child for child in root.children if child.move == move)
+            self.root.parent = None
+            self.masks = [masks[0] | 1 << move, masks[1]]
+        return move
+
+    def _new_root(self, masks: List[int]) -> Node:
+        return Node(None, None, self._empty_cells(masks))
+
+    def _reuse(self, masks: List[int]) -> Optional[Node]:
+        '''
+        Find the subtree of the opponent's answer
+        to the last move, if the position follows it
+        '''
+        if self.root is None or self.masks is None: return None
+        if masks[0] != self.masks[0] or masks[1] & self.masks[1] != self.masks[1]:
+            return None
+        answer = masks[1] & ~self.masks[1]
+        for child in self.root.children:
+            if answer == 1 << child.move:
+                child.parent = None
+                return child
+        return None
+
+    def _empty_cells(self, masks: List[int]) -> List[int]:
+        occupied = masks[0] | masks[1]
+        cells = [idx for idx in range(self.cells) if not occupied >> idx & 1]
+        self.rng.shuffle(cells)
+        return cells
+
+    def search(self, root: Node, masks: List[int]) -> None:
+        '''
+        Grow the tree until the budget runs out
+        '''
+        deadline = perf_counter() + self.time_budget
+        iteration = 0
+        while (self.iterations is None or iteration < self.iterations) and (
+            perf_counter() < deadline or not root.children
+        ):
+            self._iterate(root, masks)
+            iteration += 1
+
+    def _iterate(self, root: Node, masks: List[int]) -> None:
+        node, masks, side = root, list(masks), 0
+
+        # selection: descend while the nodes are fully expanded
+        while not node.untried and node.children and node.winner is None:
+            node = self._select(node)
+            masks[side] |= 1 << node.move
+            side ^= 1
+
+        # expansion
+        if node.untried and node.winner is None:
+            idx = node.untried.pop()
+            masks[side] |= 1 << idx
+            winner = None
+            if self._completes_line(masks[side], idx): winner = side
+            elif masks[0] | masks[1] == self.full: winner = DRAW
+            untried = [] if winner is not None else self._empty_cells(masks)
+            child = Node(idx, node, untried, winner)
+            node.children.append(child)
+            node = child
+            side ^= 1
+
+        winner = node.winner
+        if winner is None: winner = self._rollout(masks, side)
+
+        # backpropagation, the node was moved into by the opposite side
+        mover = side ^ 1
+        while node is not None:
+            node.visits += 1
+            if winner == mover: node.wins += 1
+            elif winner == DRAW: node.wins += 0.5
+            node = node.parent
+            mover ^= 1
+
+    def _select(self, node: Node) -> Node:
+        scale = self.exploration * sqrt(log(node.visits))
+        return max(
+            node.children,
+            key=lambda child: child.wins / child.visits
+            + scale / sqrt(child.visits),
+        )
+
+    def _completes_line(self, mask: int, idx: int) -> bool:
+        return any(mask & line == line for line in self.lines[idx])
+
+    def _rollout(self, masks: List[int], side: int) -> int:
+        # random playout: the empty cells are taken in random order
+        masks = list(masks)
+        for idx in self._empty_cells(masks):
+            masks[side] |= 1 << idx
+            if self._completes_line(masks[side], idx): return side
+            side ^= 1
+        return DRAW
+
+    def _parallel_visits(self, masks: List[int]) -> Dict[int, int]:
+        if self.pool is None:
+            self.pool = ProcessPoolExecutor(max_workers=self.workers)
+        tasks = [
+            (
+                self.board_size,
+                self.win_length,
+                masks,
+                self.time_budget,
+                self.iterations,
+                self.exploration,
+                self.rng.getrandbits(32),
+            )
+            for _ in range(self.workers)
+        ]
+        visits: Dict[int, int] = {}
+        for result in self.pool.map(search_visits, tasks):
+            for move, count in result.items():
+                visits[move] = visits.get(move, 0) + count
+        return visits
+
+
+def search_visits(task) -> Dict[int, int]:
+    '''
+    Grow a tree in a worker process
+    Returns: the visit counts of the moves from the root
+    '''
+    board_size, win_length, masks, time_budget, iterations, exploration, seed = task
+    player = MCTSPlayer(
+        None,
+        board_size,
+        win_length,
+        time_budget=time_budget,
+        iterations=iterations,
+        exploration=exploration,
+        seed=seed,
+    )
+    root = player._new_root(masks)
+    player.search(root, masks)
+    return {child.move: child.visits for child in root.children}
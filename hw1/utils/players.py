@@ -0,0 +1,67 @@
+from random import Random
+from typing import Hashable, List, Optional
+
+
+class BoardPlayer:
+    '''
+    Base class for the players which pick moves by looking
+    at the board themselves (i.e. bots). Instances are callable
+    and follow the contract of `on_action` callbacks of `PlayTicTacToe`:
+    each call returns `(x, y, mark)` tuple
+
+    The live board is given to the player by `TicTacToe` via `bind`
+
+    Arguments:
+
+    + `mark`: the mark of the player
+    + `board_size`: int, the board size
+    + `win_length`: int (optional), the number of marks in a row
+      needed to win, defaults to the board size
+    '''
+
+    def __init__(
+        self, mark: Hashable, board_size: int, win_length: Optional[int] = None
+    ) -> None:
+        self.mark = mark
+        self.board_size = board_size
+        self.win_length = board_size if win_length is None else win_length
+        self.board: Optional[List[Optional[Hashable]]] = None
+
+    def bind(self, board: List[Optional[Hashable]]) -> None:
+        self.board = board
+
+    def choose(self, board: List[Optional[Hashable]]) -> int:
+        '''
+        Pick the cell to put the mark onto
+        Returns: the index of the cell on the board
+        '''
+        raise NotImplementedError
+
+    def __call__(self):
+        if self.board is None:
+            raise RuntimeError(f"The player is not bound to a board")
+        y, x = divmod(self.choose(self.board), self.board_size)
+        return x, y, self.mark
+
+
+class RandomPlayer(BoardPlayer):
+    '''
+    Puts the mark onto a random empty cell
+
+    Arguments: same as for `BoardPlayer`, and
+
+    + `seed`: (optional), the seed for the random generator
+    '''
+
+    def __init__(
+        self,
+        mark: Hashable,
+        board_size: int,
+        win_length: Optional[int] = None,
+        seed=None,
+    ) -> None:
+        super().__init__(mark, board_size, win_length)
+        self.rng = Random(seed)
+
+    def choose(self, board: List[Optional[Hashable]]) -> int:
+        return self.rng.choice([i for i, cell in enumerate(board) if cell is None])
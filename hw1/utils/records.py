@@ -0,0 +1,277 @@
+'''
+Compact binary records of Tic-tac-toe games
+
+Only the sequence of the moves is stored, one byte per move
+(the index of the cell), thus the boards up to 16x16 are supported.
+The file starts with a header holding the game settings, followed
+by the records, each of them being the number of moves, the result
+and the moves. The records are appended to the end of the file,
+the offsets of the records are appended to the index file next to it
+'''
+import mmap
+import os
+import struct
+import sys
+from array import array
+from collections import Counter
+from dataclasses import dataclass
+from typing import Iterator, Optional, Sequence, Tuple
+
+from .tictactoe import TicTacToe
+
+MAGIC = b'TTTG'
+VERSION = 1
+# magic, version, board size, win length
+HEADER = struct.Struct('<4sBBBx')
+# the number of moves, the result
+RECORD = struct.Struct('<HB')
+MAX_BOARD_SIZE = 16
+INDEX_SUFFIX = '.idx'
+
+# results of the games
+DRAW, FIRST, SECOND = 0, 1, 2
+
+
+@dataclass(frozen=True)
+class GameRecord:
+    moves: bytes
+    result: int
+
+    def __len__(self) -> int:
+        return len(self.moves)
+
+
+def read_header(path: str) -> Tuple[int, int]:
+    with open(path, 'rb') as file:
+        data = file.read(HEADER.size)
+    if len(data) < HEADER.size: data = bytes(HEADER.size)
+    magic, version, board_size, win_length = HEADER.unpack(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"Not a game records file: {path}")
+    return board_size, win_length
+
+
+def scan_offsets(buffer) -> array:
+    '''
+    Collect the offsets of the records by walking them one by one
+    '''
+    offsets = array('Q')
+    offset, size = HEADER.size, len(buffer)
+    while offset < size:
+        offsets.append(offset)
+        length, _ = RECORD.unpack_from(buffer, offset)
+        offset += RECORD.size + length
+    return offsets
+
+
+def load_index(path: str) -> array:
+    offsets = array('Q')
+    if os.path.exists(path):
+        with open(path, 'rb') as file:
+            data = file.read()
+        # the entry cut off by a crash is dropped
+        offsets.frombytes(data[: len(data) - len(data) % offsets.itemsize])
+        if sys.byteorder == 'big': offsets.byteswap()
+    return offsets
+
+
+def index_covers(buffer, offsets: array) -> bool:
+    '''
+    Whether the index covers the records: it starts at the first record
+    and its last entry is the record ending at the end of the file. The
+    entries are appended right after the records, thus only the tail of
+    the index can go missing (e.g. on a crash), which is detected here
+    '''
+    size = len(buffer)
+    if not offsets: return size <= HEADER.size
+    last = offsets[-1]
+    if offsets[0] != HEADER.size or last + RECORD.size > size: return False
+    length, _ = RECORD.unpack_from(buffer, last)
+    return last + RECORD.size + length == size
+
+
+class GameWriter:
+    '''
+    Appends the records to the file, the file is created
+    if it does not exist yet, otherwise the game settings
+    should match the ones in its header
+
+    Arguments:
+
+    + `path`: str, the records file
+    + `board_size`: int, the board size (up to 16)
+    + `win_length`: int (optional), defaults to the board size
+    '''
+
+    def __init__(
+        self, path: str, board_size: int, win_length: Optional[int] = None
+    ) -> None:
+        if not 0 < board_size <= MAX_BOARD_SIZE:
+            raise ValueError(f"Board size should be in [1, {MAX_BOARD_SIZE}]")
+        win_length = board_size if win_length is None else win_length
+        self.board_size = board_size
+        self.win_length = win_length
+
+        if os.path.exists(path) and os.path.getsize(path):
+            if read_header(path) != (board_size, win_length):
+                raise ValueError(f"The records are for another game: {path}")
+            self.offset = os.path.getsize(path)
+            self._check_index(path)
+            self.file = open(path, 'ab')
+        else:
+            self.file = open(path, 'wb')
+            self.file.write(HEADER.pack(MAGIC, VERSION, board_size, win_length))
+            self.offset = HEADER.size
+            # stale index of the previous file
+            if os.path.exists(path + INDEX_SUFFIX): os.remove(path + INDEX_SUFFIX)
+
+        self.index = open(path + INDEX_SUFFIX, 'ab')
+
+    @staticmethod
+    def _check_index(path: str) -> None:
+        # the new offsets are appended to the index, thus it should
+        # cover the records already in the file, otherwise it is rebuilt
+        with open(path, 'rb') as file:
+            buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            if index_covers(buffer, load_index(path + INDEX_SUFFIX)): return
+            offsets = scan_offsets(buffer)
+        finally:
+            buffer.close()
+        if sys.byteorder == 'big': offsets.byteswap()
+        with open(path + INDEX_SUFFIX, 'wb') as file:
+            file.write(offsets.tobytes())
+
+    def __enter__(self) -> 'GameWriter':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.file.close()
+        self.index.close()
+
+    def write(self, moves: Sequence[int], result: int) -> None:
+        record = RECORD.pack(len(moves), result) + bytes(moves)
+        self.file.write(record)
+        self.index.write(struct.pack('<Q', self.offset))
+        self.offset += len(record)
+
+    def record(self, game: TicTacToe):
+        '''
+        Wrap the game loop: the items of `game.play()` are passed
+        through and the game is written once it is over
+        '''
+        moves = []
+        for board, state in game.play():
+            # a new mark is on the board
+            if game.board_size**2 - game.empty > len(moves):
+                moves.append(game.last_move)
+            yield board, state
+
+        if game.winner is None: result = DRAW
+        else: result = FIRST if len(moves) % 2 else SECOND
+        self.write(moves, result)
+
+
+class GameReader:
+    '''
+    Reads the records from the memory-mapped file, the records
+    can be streamed or accessed by their numbers (via the index)
+
+    Arguments:
+
+    + `path`: str, the records file
+    '''
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.board_size, self.win_length = read_header(path)
+        with open(path, 'rb') as file:
+            self.buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._offsets: Optional[array] = None
+
+    def close(self) -> None:
+        self.buffer.close()
+
+    def __enter__(self) -> 'GameReader':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _read(self, offset: int) -> Tuple[GameRecord, int]:
+        length, result = RECORD.unpack_from(self.buffer, offset)
+        start, end = offset + RECORD.size, offset + RECORD.size + length
+        return GameRecord(self.buffer[start:end], result), end
+
+    def __iter__(self) -> Iterator[GameRecord]:
+        offset, size = HEADER.size, len(self.buffer)
+        while offset < size:
+            record, offset = self._read(offset)
+            yield record
+
+    @property
+    def offsets(self) -> array:
+        '''
+        Offsets of the records, loaded from the index file
+        or collected by scanning the records if it is missing
+        '''
+        if self._offsets is not None: return self._offsets
+
+        offsets = load_index(self.path + INDEX_SUFFIX)
+        # the index is rebuilt if it does not cover the file
+        if not index_covers(self.buffer, offsets): offsets = scan_offsets(self.buffer)
+
+        self._offsets = offsets
+        return offsets
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def __getitem__(self, i: int) -> GameRecord:
+        return self._read(self.offsets[i])[0]
+
+
+def replay(record: GameRecord, board_size: int, win_length: Optional[int] = None):
+    '''
+    Replay the game lazily: yields the same items
+    as `TicTacToe.play()` for the recorded moves
+    '''
+    moves = iter(record.moves)
+
+    def action_factory(mark):
+        def action():
+            y, x = divmod(next(moves), board_size)
+            return x, y, mark
+        return action
+
+    actions = action_factory('X'), action_factory('O')
+    game = TicTacToe(board_size, *actions, win_length=win_length)
+    yield from game.play()
+
+
+def opening_frequencies(reader: GameReader, plies: int = 1) -> Counter:
+    '''
+    Count the openings: the sequences of the first `plies` moves
+    '''
+    return Counter(bytes(record.moves[:plies]) for record in reader)
+
+
+def game_stats(reader: GameReader) -> dict:
+    '''
+    The number of games, the results and the average game length
+    '''
+    results, total = Counter(), 0
+    for record in reader:
+        results[record.result] += 1
+        total += len(record.moves)
+    games = sum(results.values())
+    return dict(
+        games=games,
+        first=results[FIRST],
+        second=results[SECOND],
+        draw=results[DRAW],
+        mean_length=total / games if games else 0.0,
+    )
@@ -0,0 +1,222 @@
+'''
+Asyncio TCP server hosting many Tic-tac-toe games at once
+
+The protocol is line-based: the clients are paired in the order
+they connect, the first one of a pair plays the first mark.
+The server writes the board after each move, prompts the player
+to move with `MOVE` and finishes the game with `WINNER <mark>` or `DRAW`.
+The players answer with the coordinates separated by the delimeter
+
+Usage: `python -m utils.server [<port>]`
+'''
+import asyncio
+import sys
+from typing import Hashable, List, Optional, Sequence, Tuple
+
+from .bitboard import BitBoard
+from .io import parse_move
+from .tictactoe import TicTacToe
+
+Player = Tuple[asyncio.StreamReader, asyncio.StreamWriter]
+
+
+class PlayerLeft(Exception):
+    pass
+
+
+def format_board(board: List[Optional[Hashable]], board_size: int) -> str:
+    cell = lambda mark: ' ' if mark is None else str(mark)
+    rows = (
+        ' | '.join(map(cell, board[i : i + board_size]))
+        for i in range(0, board_size**2, board_size)
+    )
+    return '\n'.join(rows) + '\n'
+
+
+class GameServer:
+    '''
+    Serves the games in a single thread: each game session is
+    a coroutine which awaits the moves from the players' connections
+    and drives `TicTacToe` engine with them
+
+    Arguments:
+
+    + `board_size`: int (default 3), the board size
+    + `marks`: the marks of the players
+    + `delim`: str (default ':'), the coordinates delimeter
+    + `win_length`: int (optional), the number of marks in a row to win
+    + `engine`: the board engine factory (default `BitBoard`)
+    + `move_timeout`: float (optional), seconds for a player to move,
+      the game is aborted if the player does not answer in time
+    '''
+
+    def __init__(
+        self,
+        board_size: int = 3,
+        marks: Sequence[Hashable] = ('X', 'O'),
+        delim: str = ':',
+        win_length: Optional[int] = None,
+        engine=BitBoard,
+        move_timeout: Optional[float] = None,
+    ) -> None:
+        self.board_size = board_size
+        self.marks = tuple(marks)
+        self.delim = delim
+        self.win_length = win_length
+        self.engine = engine
+        self.move_timeout = move_timeout
+        # the players waiting for the opponents to connect along with
+        # the futures resolved once their games end and the tasks
+        # watching their connections (the players may leave while waiting)
+        self.lobby: List[Tuple[Player, asyncio.Future, asyncio.Task]] = []
+        self.active = 0
+        self.played = 0
+
+    async def start(self, host: str = '127.0.0.1', port: int = 0):
+        '''
+        Start listening
+        Returns: `asyncio.Server` object (the actual port can
+        be found among its sockets if 0 was given)
+        '''
+        return await asyncio.start_server(self.handle_client, host, port)
+
+    async def handle_client(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        # the players who have left while waiting are not paired
+        self.lobby = [entry for entry in self.lobby if not entry[0][0].at_eof()]
+        if len(self.lobby) + 1 < len(self.marks):
+            await self.wait_opponents(reader, writer)
+            return
+
+        entries, self.lobby = self.lobby, []
+        players = [player for player, _, _ in entries] + [(reader, writer)]
+        # the readers are released by the watchers before the game starts
+        for _, _, watch in entries: watch.cancel()
+        await asyncio.gather(*(watch for _, _, watch in entries), return_exceptions=True)
+
+        self.active += 1
+        try:
+            await self.run_session(players)
+        finally:
+            self.active -= 1
+            self.played += 1
+            for _, writer in players:
+                writer.close()
+            for _, done, _ in entries:
+                if not done.done(): done.set_result(None)
+
+    async def wait_opponents(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        done = asyncio.get_running_loop().create_future()
+        watch = asyncio.create_task(self.watch_connection(reader))
+        entry = ((reader, writer), done, watch)
+        self.lobby.append(entry)
+        writer.write(b'WAITING\n')
+
+        # the watcher is cancelled once the opponents have connected
+        await asyncio.wait((watch, done), return_when=asyncio.FIRST_COMPLETED)
+        if watch.cancelled():
+            # the connection is kept open until the game is over
+            await done
+            return
+
+        if entry in self.lobby: self.lobby.remove(entry)
+        writer.close()
+
+    @staticmethod
+    async def watch_connection(reader: asyncio.StreamReader) -> None:
+        # returns once the player disconnects, the data
+        # sent before the game starts is discarded
+        try:
+            while await reader.read(1 << 10): pass
+        except ConnectionError:
+            pass
+
+    async def run_session(self, players: Sequence[Player]) -> None:
+        writers = [writer for _, writer in players]
+        turn = 0
+
+        def broadcast(text: str) -> None:
+            for writer in writers:
+                writer.write(text.encode())
+
+        # the same callbacks as for `PlayTicTacToe`,
+        # the output is written to the players' connections
+        def on_start():
+            for writer, mark in zip(writers, self.marks):
+                writer.write(f'WELCOME {mark}\n'.encode())
+
+        def on_move(board):
+            broadcast(format_board(board, self.board_size))
+
+        def on_win(winner):
+            broadcast('DRAW\n' if winner is None else f'WINNER {winner}\n')
+
+        def on_error(state):
+            if state: return
+            writers[turn].write(b'BAD INPUT\n')
+
+        # the engine calls the input callers synchronously, thus
+        # the move is fetched beforehand and handed over to the caller
+        pending = None
+
+        def action():
+            return pending
+
+        actions = (action,) * len(self.marks)
+
+        game = TicTacToe(
+            self.board_size,
+            *actions,
+            engine=self.engine,
+            win_length=self.win_length,
+        )
+        steps = game.play()
+
+        on_start()
+        board, _ = next(steps)
+        on_move(board)
+
+        try:
+            while not game.finished:
+                pending = await self.fetch_move(players[turn], self.marks[turn])
+                board, state = next(steps)
+                on_move(board)
+                on_error(state)
+                if state: turn = (turn + 1) % len(players)
+        except PlayerLeft:
+            broadcast('OPPONENT LEFT\n')
+        else:
+            for _ in steps: pass
+            on_win(game.winner)
+
+        for writer in writers:
+            try: await writer.drain()
+            except ConnectionError: pass
+
+    async def fetch_move(self, player: Player, mark: Hashable):
+        '''
+        Prompt the player and wait for the answer
+        Raises: `PlayerLeft` if the connection is closed or timed out
+        '''
+        reader, writer = player
+        writer.write(b'MOVE\n')
+        try:
+            await writer.drain()
+            line = await asyncio.wait_for(reader.readline(), self.move_timeout)
+        except (ConnectionError, asyncio.TimeoutError):
+            raise PlayerLeft
+        if not line: raise PlayerLeft
+        return parse_move(line.decode(errors='replace'), self.delim, mark)
+
+
+async def serve(port: int) -> None:
+    server = await GameServer().start(port=port)
+    async with server:
+        await server.serve_forever()
+
+
+if __name__ == '__main__':
+    asyncio.run(serve(int(sys.argv[1]) if len(sys.argv) > 1 else 8888))
@@ -0,0 +1,264 @@
+'''
+Precomputed tablebase of Tic-tac-toe positions for small boards
+
+All the positions reachable from the empty board are enumerated
+and solved, the positions equal up to rotation and reflection of
+the board are stored once (under the smallest key among the 8
+symmetric ones). The file holds the sorted keys followed by the
+values and the best moves, thus can be memory-mapped and searched
+in place, without loading
+
+Usage: `python -m utils.tablebase <board size> <path> [<win length>]`
+'''
+import mmap
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from functools import lru_cache
+from typing import Dict, Hashable, List, Optional, Sequence, Tuple
+
+from .bitboard import win_masks
+from .players import BoardPlayer
+
+MAGIC = b'TTTB'
+VERSION = 1
+# magic, version, board size, win length, number of positions
+HEADER = struct.Struct('<4sBBBxQ')
+# the key of a position is a base-3 number which
+# should fit into 64 bits (3^36 < 2^64)
+MAX_BOARD_SIZE = 6
+
+
+@lru_cache(maxsize=None)
+def symmetries(board_size: int) -> Tuple[Tuple[int, ...], ...]:
+    '''
+    Rotations and reflections of the board as permutations:
+    the cell `i` of the transformed board is the cell `perm[i]` of the original
+    '''
+    last = board_size - 1
+    transforms = (
+        lambda x, y: (x, y),
+        lambda x, y: (last - y, x),
+        lambda x, y: (last - x, last - y),
+        lambda x, y: (y, last - x),
+        lambda x, y: (last - x, y),
+        lambda x, y: (x, last - y),
+        lambda x, y: (y, x),
+        lambda x, y: (last - y, last - x),
+    )
+    perms = []
+    for transform in transforms:
+        perm = []
+        for idx in range(board_size**2):
+            x, y = transform(*divmod(idx, board_size)[::-1])
+            perm.append(y * board_size + x)
+        perms.append(tuple(perm))
+    return tuple(perms)
+
+
+@lru_cache(maxsize=None)
+def key_weights(board_size: int) -> Tuple[Tuple[int, ...], ...]:
+    '''
+    For each symmetry, the weight of a cell in the key of the
+    transformed board, i.e. `3 ** i` where `i` is the position
+    the cell is moved to
+    '''
+    weights = []
+    for perm in symmetries(board_size):
+        inverse = [0] * len(perm)
+        for i, idx in enumerate(perm): inverse[idx] = i
+        weights.append(tuple(3**i for i in inverse))
+    return tuple(weights)
+
+
+def canonical_key(cells: Sequence[int], board_size: int) -> Tuple[int, int]:
+    '''
+    Arguments:
+        `cells`: the board with 0 for empty cells, 1 and 2 for the marks
+        of the first and the second player respectively
+    Returns:
+        the smallest key among the symmetric boards and the index
+        of the symmetry it is obtained with
+    '''
+    keys = [
+        sum(code * weight for code, weight in zip(cells, weights) if code)
+        for weights in key_weights(board_size)
+    ]
+    key = min(keys)
+    return key, keys.index(key)
+
+
+def solve(
+    board_size: int, win_length: Optional[int] = None
+) -> Dict[int, Tuple[int, int]]:
+    '''
+    Enumerate and solve all the reachable positions where the game
+    is not over yet
+
+    Returns: mapping of the canonical keys to the value of the position
+    for the player to move (1 is a win, 0 is a draw, -1 is a loss)
+    and the best move on the canonical board
+    '''
+    if not 0 < board_size <= MAX_BOARD_SIZE:
+        raise ValueError(f"Board size should be in [1, {MAX_BOARD_SIZE}]")
+    win_length = board_size if win_length is None else win_length
+    lines = win_masks(board_size, win_length)
+    weights = key_weights(board_size)
+    perms = symmetries(board_size)
+    cells = board_size**2
+    table: Dict[int, Tuple[int, int]] = {}
+
+    def search(keys: Tuple[int, ...], masks: List[int], side: int, empty: int) -> int:
+        # keys of all the symmetric boards are updated incrementally
+        key = min(keys)
+        if key in table: return table[key][0]
+
+        best_value, best_move = -2, None
+        occupied = masks[0] | masks[1]
+        for idx in range(cells):
+            if occupied >> idx & 1: continue
+            own = masks[side] | 1 << idx
+            if any(own & line == line for line in lines[idx]):
+                value = 1
+            elif empty == 1:
+                value = 0
+            else:
+                code = side + 1
+                child_keys = tuple(k + code * w[idx] for k, w in zip(keys, weights))
+                child = [own, masks[1]] if side == 0 else [masks[0], own]
+                value = -search(child_keys, child, 1 - side, empty - 1)
+            if value > best_value: best_value, best_move = value, idx
+
+        # the move is stored in the frame of the canonical board
+        frame = keys.index(key)
+        table[key] = best_value, perms[frame].index(best_move)
+        return best_value
+
+    search((0,) * len(weights), [0, 0], 0, cells)
+    return table
+
+
+def write_tablebase(
+    path: str, board_size: int, win_length: Optional[int] = None
+) -> int:
+    '''
+    Solve the game and write the tablebase to the file
+
+    Returns: the number of stored positions
+    '''
+    win_length = board_size if win_length is None else win_length
+    table = solve(board_size, win_length)
+    keys = array('Q', sorted(table))
+    values = array('b', (table[key][0] for key in keys))
+    moves = array('B', (table[key][1] for key in keys))
+    # the file is little-endian
+    if sys.byteorder == 'big': keys.byteswap()
+
+    with open(path, 'wb') as file:
+        file.write(HEADER.pack(MAGIC, VERSION, board_size, win_length, len(keys)))
+        file.write(keys.tobytes())
+        file.write(values.tobytes())
+        file.write(moves.tobytes())
+    return len(keys)
+
+
+class Tablebase:
+    '''
+    Memory-mapped tablebase file, positions are looked up
+    by binary search over the sorted keys in place
+
+    Arguments:
+
+    + `path`: str, the tablebase file written by `write_tablebase`
+    '''
+
+    def __init__(self, path: str) -> None:
+        with open(path, 'rb') as file:
+            self.buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, self.board_size, self.win_length, count = (
+            HEADER.unpack_from(self.buffer)
+        )
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"Not a tablebase file: {path}")
+
+        view = memoryview(self.buffer)
+        keys_end = HEADER.size + 8 * count
+        self.keys = view[HEADER.size : keys_end].cast('Q')
+        if sys.byteorder == 'big':
+            self.keys = array('Q', self.keys)
+            self.keys.byteswap()
+        self.values = view[keys_end : keys_end + count].cast('b')
+        self.moves = view[keys_end + count : keys_end + 2 * count]
+        self.perms = symmetries(self.board_size)
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def lookup(self, cells: Sequence[int]) -> Optional[Tuple[int, int]]:
+        '''
+        Arguments:
+            `cells`: the board with 0 for empty cells, 1 and 2 for the marks
+            of the first and the second player respectively
+        Returns:
+            the value of the position for the player to move and the best
+            move (cell index) or `None` if the position is not in the table
+        '''
+        key, frame = canonical_key(cells, self.board_size)
+        i = bisect_left(self.keys, key)
+        if i == len(self.keys) or self.keys[i] != key: return None
+        return self.values[i], self.perms[frame][self.moves[i]]
+
+
+@lru_cache(maxsize=None)
+def open_tablebase(path: str) -> Tablebase:
+    # the file is mapped once per process
+    return Tablebase(path)
+
+
+class TablebasePlayer(BoardPlayer):
+    '''
+    Perfect player which looks the moves up in the tablebase
+
+    Arguments: same as for `BoardPlayer`, and
+
+    + `path`: str, the tablebase file for this board size and win length
+    '''
+
+    def __init__(
+        self,
+        mark: Hashable,
+        board_size: int,
+        win_length: Optional[int] = None,
+        path: Optional[str] = None,
+    ) -> None:
+        super().__init__(mark, board_size, win_length)
+        if path is None: raise TypeError(f"Expected tablebase path")
+        self.tablebase = open_tablebase(path)
+        if (self.tablebase.board_size, self.tablebase.win_length) != (
+            self.board_size,
+            self.win_length,
+        ):
+            raise ValueError(f"The tablebase is built for another game: {path}")
+
+    def choose(self, board: List[Optional[Hashable]]) -> int:
+        own = sum(cell == self.mark for cell in board)
+        other = sum(cell is not None for cell in board) - own
+        # the first player moves when the number of marks is equal
+        own_code = 1 if own == other else 2
+        cells = [
+            0 if cell is None else own_code if cell == self.mark else 3 - own_code
+            for cell in board
+        ]
+        entry = self.tablebase.lookup(cells)
+        if entry is None: raise LookupError(f"Position is not in the tablebase")
+        return entry[1]
+
+
+if __name__ == '__main__':
+    board_size, path, *win_length = sys.argv[1:]
+    count = write_tablebase(
+        path, int(board_size), int(win_length[0]) if win_length else None
+    )
+    print(f'{count} positions are written to {path}')
@@ -6,15 +6,46 @@ class TicTacToe:
     Arguments:
 
     + `board_size`: int, the board size
-    + `input_callers`, sequence of callable objects, the input callbacks
+    + `input_callers`, sequence of callable objects, the input callbacks.
+      If a caller has `bind` method, it is called with the board
+    + `engine`: callable (optional), the board engine factory, is called
+      with the board size and the win length (e.g. `BitBoard`).
+      By default, the board is a plain list
+    + `win_length`: int (optional), the number of marks in a row
+      (horizontally, vertically or diagonally) needed to win,
+      defaults to the board size (the classic rules)
     '''
 
-    def __init__(self, board_size: int, *input_callers) -> None:
-        self.__val_args(board_size, *input_callers)
+    # the directions to walk along when looking
+    # for a line (the opposite ones are walked as well)
+    DIRECTIONS = ((1, 0), (0, 1), (1, 1), (1, -1))
+
+    def __init__(
+        self, board_size: int, *input_callers, engine=None, win_length=None
+    ) -> None:
+        self.__val_args(
+            board_size, *input_callers, engine=engine, win_length=win_length
+        )
         self.board_size = board_size
-        self.board = [None for _ in range(board_size**2)]
+        self.win_length = board_size if win_length is None else win_length
+        self.engine = (
+            None if engine is None else engine(board_size, self.win_length)
+        )
+        self.board = (
+            [None for _ in range(board_size**2)]
+            if self.engine is None
+            else self.engine.board
+        )
         self.winner = None
         self.input_callers = input_callers
+        self.last_move = None
+        self.empty = board_size**2
+
+        # the callers which pick moves by looking at the board
+        # (e.g. bots) are given the live board before the game starts
+        for caller in input_callers:
+            bind = getattr(caller, 'bind', None)
+            if bind is not None: bind(self.board)
 
     def play(self):
         '''
@@ -24,7 +55,7 @@ class TicTacToe:
         '''
         yield self.board, True
 
-        has_empty = lambda: None in self.board
+        has_empty = lambda: self.empty > 0
 
         # play while the winner is not found and there
         # still is some empty space on the board
@@ -34,62 +65,79 @@ class TicTacToe:
                 while not state and has_empty():
                     x, y, mark = caller()
                     state = self.__make_move(x, y, mark)
+                    # the winner is known by the time the board is yielded
+                    if state: self.winner = self.__game_step()
                     yield self.board, state
-                self.winner = self.__game_step()
                 # if the winner was actually found
                 if self.winner is not None: break
 
+    @property
+    def finished(self) -> bool:
+        '''
+        Whether the game is over, i.e. no more input
+        callers will be called by `play`
+        '''
+        return self.winner is not None or self.empty == 0
+
     def __make_move(self, x, y, mark) -> bool:
         if x < 0 or y < 0: return False
         idx = y * self.board_size + x
         try:
-            if self.board[idx] is not None: return False
+            if self.engine is not None:
+                if not self.engine.place(idx, mark): return False
+            elif self.board[idx] is not None: return False
+            else: self.board[idx] = mark
         except IndexError: return False
 
-        self.board[idx] = mark
+        self.last_move = idx
+        self.empty -= 1
         return True
 
     def __game_step(self):
         '''
-        Iterate over the board and check all the feasible
-        positions on the board (rows, columns and the main diagonals)
+        Check the lines passing through the last move:
+        walk outward from it in each direction and count
+        the marks in a row, thus the cost of a check does
+        not depend on the board size
         '''
-        def iter_rows():
-            for i in range(0, self.board_size**2, self.board_size):
-                from_ = i
-                to_ = i + self.board_size
-                yield self.board[from_:to_]
-
-        def iter_cols():
-            for i in range(self.board_size):
-                yield self.board[i::self.board_size]
-
-        def iter_main_diag():
-            for i, cell in enumerate(self.board):
-                x, y = divmod(i, self.board_size)
-                if x == y: yield cell
-
-        def iter_secondary_diag():
-            for i, cell in enumerate(self.board):
-                x, y = divmod(i, self.board_size)
-                if self.board_size - 1 - x == y: yield cell
-
-        for row in map(set, iter_rows()):
-            if len(row) == 1: return min(row)
-
-        for col in map(set, iter_cols()):
-            if len(col) == 1: return min(col)
-
-        main_diag, secondary_diag = set(iter_main_diag()), set(iter_secondary_diag())
-
-        if len(main_diag) == 1: return min(main_diag)
-        if len(secondary_diag) == 1: return min(secondary_diag)
-
-
-    def __val_args(self, board_size: int, *input_callers) -> None:
+        if self.last_move is None: return None
+        if self.engine is not None: return self.engine.winner(self.last_move)
+
+        mark = self.board[self.last_move]
+        y, x = divmod(self.last_move, self.board_size)
+
+        def run_length(dx, dy):
+            # number of the same marks in a row next to the
+            # last move (the move itself is not counted)
+            length = 0
+            xx, yy = x + dx, y + dy
+            while (
+                length < self.win_length - 1
+                and 0 <= xx < self.board_size
+                and 0 <= yy < self.board_size
+                and self.board[yy * self.board_size + xx] == mark
+            ):
+                length += 1
+                xx, yy = xx + dx, yy + dy
+            return length
+
+        for dx, dy in self.DIRECTIONS:
+            if 1 + run_length(dx, dy) + run_length(-dx, -dy) >= self.win_length:
+                return mark
+
+    def __val_args(
+        self, board_size: int, *input_callers, engine=None, win_length=None
+    ) -> None:
         # validate the arguments provided to the class constructor
         if not isinstance(board_size, int):
             raise TypeError(f"Expected integer board size")
+        if engine is not None and not callable(engine):
+            raise TypeError(f"Non-callable board engine: {engine}")
+        if win_length is not None:
+            if not isinstance(win_length, int):
+                raise TypeError(f"Expected integer win length")
+            if not 0 < win_length <= board_size:
+                raise ValueError(f"Win length should be in [1, {board_size}]")
         for i, caller in enumerate(input_callers):
             if callable(caller): continue
             raise TypeError(f"Non-callable argument at position {i}: {caller}")
@@ -0,0 +1,152 @@
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from itertools import permutations
+from os import cpu_count
+from typing import Callable, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from .bitboard import BitBoard
+from .io import PlayTicTacToe
+
+MARKS = ('X', 'O')
+OUTCOMES = ('win', 'draw', 'loss')
+
+# the task for a worker: the factories of the players
+# (the first one moves first), the number of games and the game settings
+Task = Tuple[Tuple[Callable, Callable], int, int, Optional[int]]
+
+
+def play_games(task: Task) -> Tuple[int, int, int]:
+    '''
+    Play a chunk of games between two players, nothing is printed
+
+    Returns: the number of wins, draws and losses of the first player
+    '''
+    factories, n_games, board_size, win_length = task
+    results = Counter()
+
+    def on_win(winner):
+        results[winner] += 1
+
+    noop = lambda *args: None
+
+    for _ in range(n_games):
+        actions = tuple(
+            factory(mark, board_size, win_length)
+            for factory, mark in zip(factories, MARKS)
+        )
+        try:
+            PlayTicTacToe(
+                board_size=board_size,
+                marks=MARKS,
+                on_start=noop,
+                on_move=noop,
+                on_win=on_win,
+                on_action=actions,
+                engine=BitBoard,
+                win_length=win_length,
+            )
+        finally:
+            # the players may hold resources (e.g. the pool of `MCTSPlayer`)
+            for action in actions:
+                if hasattr(action, 'close'): action.close()
+
+    first, second = MARKS
+    return results[first], results[None], results[second]
+
+
+@dataclass
+class TournamentResult:
+    '''
+    Outcomes of the games for each pairing `(first, second)`
+    from the perspective of the first player (who moves first)
+    '''
+
+    table: Dict[Tuple[str, str], Counter] = field(default_factory=dict)
+
+    def add(self, pairing: Tuple[str, str], outcomes: Iterable[int]) -> None:
+        counter = self.table.setdefault(pairing, Counter())
+        counter.update(dict(zip(OUTCOMES, outcomes)))
+
+    def standings(self) -> Dict[str, Counter]:
+        '''
+        Total wins, draws and losses of each player
+        (both as the first and the second one)
+        '''
+        totals: Dict[str, Counter] = {}
+        for (first, second), outcomes in self.table.items():
+            totals.setdefault(first, Counter()).update(outcomes)
+            totals.setdefault(second, Counter()).update(
+                win=outcomes['loss'], draw=outcomes['draw'], loss=outcomes['win']
+            )
+        return totals
+
+    def format_table(self) -> str:
+        rows = [f"{'first':>16} {'second':>16} {'win':>6} {'draw':>6} {'loss':>6}"]
+        for (first, second), outcomes in sorted(self.table.items()):
+            counts = ' '.join(f'{outcomes[outcome]:>6}' for outcome in OUTCOMES)
+            rows.append(f'{first:>16} {second:>16} {counts}')
+        return '\n'.join(rows)
+
+
+def round_robin(
+    factories: Mapping[str, Callable],
+    n_games: int,
+    board_size: int = 3,
+    win_length: Optional[int] = None,
+    workers: Optional[int] = None,
+    chunk_size: int = 50,
+) -> TournamentResult:
+    '''
+    Play every ordered pairing of the players `n_games` times
+
+    Arguments:
+
+    + `factories`: mapping of the player names to the factories, each
+      one is called with the mark, the board size and the win length
+      and returns an `on_action` callable (e.g. `RandomPlayer`).
+      The factories are sent to other processes, thus should be picklable
+      (module-level classes and functions or `functools.partial` of them)
+    + `n_games`: int, the number of games per pairing
+    + `board_size`, `win_length`: the game settings
+    + `workers`: int (optional), the number of processes,
+      defaults to the number of CPUs. If 0, the games are played in
+      the current process
+    + `chunk_size`: int (default 50), the games of a pairing
+      are split into tasks of this many games
+
+    Returns: `TournamentResult` with the per-pairing tables
+    '''
+    if n_games < 0 or chunk_size <= 0:
+        raise ValueError(f"Expected non-negative games and positive chunk size")
+
+    pairings = list(permutations(factories, 2))
+    tasks: List[Task] = []
+    task_pairings: List[Tuple[str, str]] = []
+
+    for first, second in pairings:
+        for start in range(0, n_games, chunk_size):
+            chunk = min(chunk_size, n_games - start)
+            pair = factories[first], factories[second]
+            tasks.append((pair, chunk, board_size, win_length))
+            task_pairings.append((first, second))
+
+    result = TournamentResult()
+    for pairing in pairings: result.add(pairing, (0, 0, 0))
+
+    def collect(outcomes):
+        for pairing, outcome in zip(task_pairings, outcomes):
+            result.add(pairing, outcome)
+
+    if workers == 0:
+        collect(map(play_games, tasks))
+        return result
+
+    workers = workers or cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # the tasks are sent to the workers in batches
+        # to reduce the communication overhead
+        batch = max(1, len(tasks) // (4 * workers))
+        collect(executor.map(play_games, tasks, chunksize=batch))
+
+    return result
@@ -0,0 +1,5 @@
+"""
+Benchmarks of the HTML parser
+
+Usage: `python -m bench.run --help` from the hw2 directory
+"""
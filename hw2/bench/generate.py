@@ -0,0 +1,113 @@
+"""
+Synthetic HTML documents for the benchmarks
+
+The document is a sequence of blocks, each block is a spine of nested
+tags (`depth` of them), every tag of the spine also has `fanout - 1`
+leaf subtags with text. The words and the attribute values are drawn
+from the pools made by Faker, the rest is done by `random`
+"""
+
+from dataclasses import asdict, dataclass
+import io
+from random import Random
+
+from faker import Faker
+
+TAG_NAMES = ("div", "p", "span", "section", "a", "li", "ul", "b", "i", "td")
+ATTR_NAMES = ("class", "id", "href", "title", "data-key", "lang", "role", "style")
+POOL_SIZE = 512
+
+
+@dataclass(frozen=True)
+class DocumentSpec:
+    """
+    The axes of the generated documents
+
+    Attributes:
+        `size`: `int`, the size of the document (characters), at least
+        `depth`: `int`, the nesting depth of the blocks
+        `fanout`: `int`, the number of subtags of each tag of the spine
+        `text_ratio`: `float`, the share of the text in [0, 1)
+        `attrs`: `int`, the number of attributes of each tag
+        `seed`: `int`, the seed of the generators
+    """
+
+    size: int = 100_000
+    depth: int = 8
+    fanout: int = 8
+    text_ratio: float = 0.5
+    attrs: int = 1
+    seed: int = 0
+
+    def __post_init__(self):
+        if self.size < 0 or self.depth < 1 or self.fanout < 1 or self.attrs < 0:
+            raise ValueError(f"Invalid document spec: {self}")
+        if not 0 <= self.text_ratio < 1:
+            raise ValueError(f"Text ratio should be in [0, 1): {self.text_ratio}")
+
+    def asdict(self) -> dict:
+        return asdict(self)
+
+
+class DocumentGenerator:
+    """
+    Writes the documents by the spec, the pools of
+    the words are made once per generator
+
+    Arguments:
+        `seed`: `int`, the seed of Faker
+    """
+
+    def __init__(self, seed: int = 0) -> None:
+        fake = Faker()
+        fake.seed_instance(seed)
+        self.words = fake.words(nb=POOL_SIZE)
+        # the values should be matched by the tag regex of the parser
+        self.values = [fake.slug() for _ in range(POOL_SIZE)]
+
+    def _text(self, rng: Random, length: int) -> str:
+        words, total = [], 0
+        while total < length:
+            word = rng.choice(self.words)
+            words.append(word)
+            total += len(word) + 1
+        return " ".join(words)
+
+    def _open(self, rng: Random, name: str, attrs: int) -> str:
+        if not attrs: return f"<{name}>"
+        pairs = (
+            f'{ATTR_NAMES[i % len(ATTR_NAMES)]}="{rng.choice(self.values)}"'
+            for i in range(attrs)
+        )
+        return f"<{name} {' '.join(pairs)}>"
+
+    def generate(self, spec: DocumentSpec) -> str:
+        rng = Random(spec.seed)
+        buffer = io.StringIO()
+        write = buffer.write
+        # the text is sized by the markup around it
+        text_scale = spec.text_ratio / (1 - spec.text_ratio)
+
+        while buffer.tell() < spec.size:
+            spine = []
+            # the spine is cut short once the document is large enough
+            while len(spine) < spec.depth and (not spine or buffer.tell() < spec.size):
+                name = rng.choice(TAG_NAMES)
+                tag = self._open(rng, name, spec.attrs)
+                write(tag)
+                spine.append(name)
+                for _ in range(spec.fanout - 1):
+                    leaf = rng.choice(TAG_NAMES)
+                    opening = self._open(rng, leaf, spec.attrs)
+                    markup = len(opening) + len(leaf) + 3
+                    write(opening)
+                    write(self._text(rng, int(markup * text_scale)))
+                    write(f"</{leaf}>")
+            for name in reversed(spine):
+                write(f"</{name}>")
+
+        return buffer.getvalue()
+
+
+def generate_document(spec: DocumentSpec) -> str:
+    return DocumentGenerator(spec.seed).generate(spec)
@@ -0,0 +1,171 @@
+"""
+Benchmark suite of the HTML parser
+
+Each case is a generated document (see `generate`), the cases vary one
+axis of the base document at a time. The timings of `parse_html` and
+`Tag.describe` (the best of the repeats) and the peak memory of parsing
+are written to JSON and compared with the baseline, if there is one
+
+Usage: `python -m bench.run [--sizes 1000 100000 ...] [--large] [--baseline path]`
+"""
+
+import argparse
+from dataclasses import replace
+import json
+import os
+import platform
+import sys
+from time import perf_counter
+import tracemalloc
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from utils.parser import parse_html
+
+from .generate import DocumentGenerator, DocumentSpec
+
+KB, MB = 1 << 10, 1 << 20
+BASE = DocumentSpec()
+SIZES = (KB, 100 * KB, MB)
+# the documents of these sizes take minutes and gigabytes to measure,
+# thus they are added on demand (`--large`)
+LARGE_SIZES = (10 * MB, 100 * MB)
+AXES = dict(
+    depth=(2, 32, 256),
+    fanout=(2, 16, 128),
+    text_ratio=(0.1, 0.5, 0.9),
+    attrs=(0, 4, 8),
+)
+METRICS = ("parse", "describe", "peak_memory")
+DEFAULT_OUTPUT = "bench_results.json"
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+
+def make_cases(sizes: Iterable[int] = SIZES) -> Dict[str, DocumentSpec]:
+    cases = {f"size={size}": replace(BASE, size=size) for size in sizes}
+    for axis, values in AXES.items():
+        for value in values:
+            cases[f"{axis}={value}"] = replace(BASE, **{axis: value})
+    return cases
+
+
+def best_time(func, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = perf_counter()
+        func()
+        best = min(best, perf_counter() - start)
+    return best
+
+
+def peak_memory(func) -> int:
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def measure(html: str, repeat: int = 3) -> dict:
+    '''
+    Time parsing and the traversal of the document, measure the peak memory
+    '''
+    noop = lambda _: None
+    root = parse_html(html)
+    return dict(
+        size=len(html),
+        parse=best_time(lambda: parse_html(html), repeat),
+        describe=best_time(lambda: root.describe(noop, noop, noop), repeat),
+        peak_memory=peak_memory(lambda: parse_html(html)),
+    )
+
+
+def run(cases: Dict[str, DocumentSpec], repeat: int = 3, log=None) -> dict:
+    generator = DocumentGenerator(BASE.seed)
+    results = {}
+    for name, spec in cases.items():
+        result = measure(generator.generate(spec), repeat)
+        results[name] = dict(spec=spec.asdict(), **result)
+        if log is not None: log(format_result(name, result))
+    return dict(
+        python=platform.python_version(), machine=platform.machine(), cases=results
+    )
+
+
+def format_result(name: str, result: dict) -> str:
+    return (
+        f"{name:<18} {result['size']:>11} chars "
+        f"parse {result['parse'] * 1e3:9.2f} ms  "
+        f"describe {result['describe'] * 1e3:9.2f} ms  "
+        f"peak {result['peak_memory'] / MB:8.2f} MB"
+    )
+
+
+def compare(results: dict, baseline: dict, tolerance: float = 0.2):
+    '''
+    Compare the results with the baseline (the cases found in both)
+    Returns:
+        the ratios of the metrics (new / baseline) by the cases and
+        the list of the regressions: `(case, metric, ratio)` beyond the tolerance
+    '''
+    ratios: Dict[str, Dict[str, float]] = {}
+    regressions: List[Tuple[str, str, float]] = []
+    for name, result in results["cases"].items():
+        old = baseline.get("cases", {}).get(name)
+        if old is None or old.get("spec") != result["spec"]: continue
+        ratios[name] = {}
+        for metric in METRICS:
+            if not old[metric]: continue
+            ratio = result[metric] / old[metric]
+            ratios[name][metric] = ratio
+            if ratio > 1 + tolerance: regressions.append((name, metric, ratio))
+    return ratios, regressions
+
+
+def load_json(path: str) -> Optional[dict]:
+    if not os.path.exists(path): return None
+    with open(path) as file:
+        return json.load(file)
+
+
+def dump_json(data: dict, path: str) -> None:
+    with open(path, "w") as file:
+        json.dump(data, file, indent=2)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES,
+                        help="sizes of the documents of the size axis (chars), "
+                             "1 KB to 1 MB by default")
+    parser.add_argument("--large", action="store_true",
+                        help="add the documents of 10 MB and 100 MB to the size axis")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", default=DEFAULT_OUTPUT)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="store the results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="the allowed slowdown (share) before it is reported")
+    args = parser.parse_args(argv)
+
+    sizes = tuple(args.sizes) + (LARGE_SIZES if args.large else ())
+    results = run(make_cases(sizes), args.repeat, log=print)
+    dump_json(results, args.output)
+
+    baseline = load_json(args.baseline)
+    if args.update_baseline or baseline is None:
+        dump_json(results, args.baseline)
+        print(f"The baseline is stored to {args.baseline}")
+        return 0
+
+    ratios, regressions = compare(results, baseline, args.tolerance)
+    for name, metrics in ratios.items():
+        print(f"{name:<18}", "  ".join(f"{k} x{v:.2f}" for k, v in metrics.items()))
+    for name, metric, ratio in regressions:
+        print(f"REGRESSION {name}: {metric} x{ratio:.2f}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,8 @@
+import pytest
+
+
+@pytest.fixture()
+def load_sample_html():
+    with open("data/test_index.html") as file:
+        html = file.read()
+    return html
@@ -0,0 +1,70 @@
+"""
+Unit-tests for the benchmark document generator and the comparison
+"""
+import pytest
+
+from bench.generate import DocumentSpec, generate_document
+from bench.run import MB, compare, main, make_cases, measure
+from utils.parser import Tag, parse_html
+
+
+def max_depth(root: Tag) -> int:
+    depth, stack = 0, [(root, 0)]
+    while stack:
+        tag, level = stack.pop()
+        depth = max(depth, level)
+        stack.extend((subtag, level + 1) for subtag in tag.subtags())
+    return depth
+
+
+@pytest.mark.parametrize(
+    "spec",
+    (
+        DocumentSpec(size=1000),
+        DocumentSpec(size=20_000, depth=64, fanout=1, text_ratio=0.0),
+        DocumentSpec(size=100_000, depth=2, fanout=8, attrs=6, text_ratio=0.9),
+    ),
+)
+def test_generate_document(spec):
+    html = generate_document(spec)
+    root = parse_html(html)
+
+    assert len(html) >= spec.size
+    assert html == generate_document(spec)
+    # the leaves are one level below the spine
+    assert 0 < max_depth(root) <= spec.depth + 1
+    first, *_ = root.subtags()
+    assert len(first.attrs) == spec.attrs
+    assert len(list(first.subtags())) == spec.fanout
+
+
+def test_document_spec_errors():
+    with pytest.raises(ValueError):
+        DocumentSpec(depth=0)
+    with pytest.raises(ValueError):
+        DocumentSpec(text_ratio=1.0)
+
+
+def test_compare():
+    cases = make_cases(sizes=(1000,))
+    spec = cases["size=1000"]
+    result = dict(spec=spec.asdict(), **measure(generate_document(spec), repeat=1))
+    baseline = dict(cases={"size=1000": result})
+    slower = dict(cases={"size=1000": dict(result, parse=result["parse"] * 2)})
+
+    ratios, regressions = compare(baseline, baseline)
+    assert ratios["size=1000"]["parse"] == 1.0 and not regressions
+    _, regressions = compare(slower, baseline)
+    assert regressions == [("size=1000", "parse", 2.0)]
+
+
+def test_large_sizes(mocker):
+    run = mocker.patch("bench.run.run", return_value=dict(cases={}))
+    mocker.patch("bench.run.dump_json")
+    mocker.patch("bench.run.load_json", return_value=None)
+
+    main(["--sizes", "1000", "--large", "--output", "out.json"])
+    cases = run.call_args.args[0]
+    assert [name for name in cases if name.startswith("size=")] == [
+        "size=1000", f"size={10 * MB}", f"size={100 * MB}"
+    ]
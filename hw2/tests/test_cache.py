@@ -0,0 +1,72 @@
+"""
+Unit-tests for the cache of the parsed documents
+"""
+import random
+
+import pytest
+
+from utils.cache import DIGEST_SIZE, ParseCache
+from utils.parser import HTML, parse_html
+
+
+def test_memory_cache():
+    cache = ParseCache(maxsize=2)
+    docs = [HTML.EXAMPLE, "<p>one</p>", "<p>two</p>"]
+
+    root = cache.parse(HTML.EXAMPLE)
+    assert root == parse_html(HTML.EXAMPLE)
+    assert cache.parse(HTML.EXAMPLE) is root
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    # the least recently used tree is evicted
+    for html in docs[1:]:
+        cache.parse(html)
+    assert len(cache) == 2
+    assert cache.parse(HTML.EXAMPLE) is not root
+    assert cache.info() == dict(hits=1, disk_hits=0, misses=4, size=2, maxsize=2)
+
+    with pytest.raises(TypeError):
+        cache.parse(b"<p></p>")
+
+
+def test_disk_cache(tmp_path):
+    html = HTML.EXAMPLE + '<p class="x">Привет</p>'
+    ParseCache(directory=str(tmp_path)).parse(html)
+
+    # the tree survives the restart
+    cache = ParseCache(directory=str(tmp_path))
+    root = cache.parse(html)
+    assert root == parse_html(html)
+    *_, para = root.subtags()
+    assert para.attrs == {"class": "x"}
+    assert (cache.disk_hits, cache.misses) == (1, 0)
+
+    # broken entries are parsed again
+    for entry in tmp_path.iterdir():
+        entry.write_bytes(b"junk")
+    cache = ParseCache(maxsize=0, directory=str(tmp_path))
+    assert cache.parse(html) == root
+    assert cache.parse(html) == root
+    assert (cache.disk_hits, cache.misses) == (1, 1)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_corrupted_entries(tmp_path, seed):
+    rng = random.Random(seed)
+    html = HTML.EXAMPLE + '<p class="x">Привет</p>'
+    expected = parse_html(html)
+    ParseCache(directory=str(tmp_path)).parse(html)
+
+    # a few bytes in the middle of the entry are flipped
+    entry, = tmp_path.iterdir()
+    data = bytearray(entry.read_bytes())
+    for i in rng.sample(range(DIGEST_SIZE, len(data)), 3):
+        data[i] ^= rng.randrange(1, 256)
+    entry.write_bytes(bytes(data))
+
+    cache = ParseCache(maxsize=0, directory=str(tmp_path))
+    assert cache.parse(html) == expected
+    assert (cache.disk_hits, cache.misses) == (0, 1)
+    # the entry is written anew
+    assert cache.parse(html) == expected
+    assert (cache.disk_hits, cache.misses) == (1, 1)
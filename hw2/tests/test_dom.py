@@ -0,0 +1,55 @@
+"""
+Unit-tests for the compact tag tree
+"""
+import pytest
+
+from utils.dom import CompactTree, Node, from_tag, parse_compact
+from utils.parser import parse_html
+
+
+def test_compact_tree(load_sample_html):
+    tree = parse_compact(load_sample_html)
+    root = parse_html(load_sample_html)
+
+    assert isinstance(tree, CompactTree)
+    assert list(tree.iter_events()) == list(root.iter_events())
+    assert list(tree.iter_events(skip_root=True)) == list(root.iter_events(True))
+    assert tree.root.to_tag() == root
+    assert from_tag(root).root.to_tag() == root
+
+
+def test_compact_bytes(load_sample_html):
+    html = load_sample_html.encode()
+    tree = parse_compact(html)
+
+    assert list(tree.iter_events()) == list(parse_html(load_sample_html).iter_events())
+
+
+def test_compact_view(mocker):
+    tree = parse_compact('<div id="x">a<p>b</p>c</div><b>d</b>')
+    root = tree.root
+
+    div, bold = root.subtags()
+    assert isinstance(div, Node)
+    assert div.parent == root
+    assert div.attrs == {"id": "x"} and bold.attrs == {}
+    names = [child if isinstance(child, str) else child.name for child in div.children]
+    assert names == ["a", "p", "c"]
+    assert list(div.content()) == ["a", "c"]
+    assert tree.content(div.index) == "ac"
+
+    on_begin_stub = mocker.stub(name="begin_stub")
+    on_end_stub = mocker.stub(name="end_stub")
+    on_content_stub = mocker.stub(name="content_stub")
+
+    bold.describe(on_begin_stub, on_end_stub, on_content_stub)
+    on_begin_stub.assert_called_once_with("b")
+    on_content_stub.assert_called_once_with("d")
+    on_end_stub.assert_called_once_with("b")
+
+
+def test_compact_errors():
+    with pytest.raises(RuntimeError):
+        parse_compact("<div> < </div>")
+    with pytest.raises(RuntimeError):
+        parse_compact(b"<div> < </div>")
@@ -0,0 +1,61 @@
+"""
+Unit-tests for incremental re-parsing of the edited documents
+"""
+import pytest
+
+from utils.incremental import Document
+from utils.parser import Tag, parse_html
+
+
+def spans(tag):
+    children = [spans(child) if isinstance(child, Tag) else child for child in tag.children]
+    return tag.name, tag.offset, tag.inner, tag.inner_end, tag.length, children
+
+
+def test_tag_spans():
+    html = "<div>ab<p>c</p><i>d</i></div><b>e"
+    root = parse_html(html)
+    div, bold = root.subtags()
+    para, italic = div.subtags()
+
+    assert (div.offset, div.inner, div.inner_end, div.length) == (0, 5, 23, 29)
+    # the offsets are relative to the previous subtag or to the parent
+    assert (para.offset, italic.offset, bold.offset) == (7, 0, 0)
+    assert html[29 + bold.inner : 29 + bold.inner_end] == "e"
+    assert root.length == len(html)
+
+
+def test_edits(load_sample_html):
+    doc = Document(load_sample_html)
+    title = doc.root.children[0].children[1].children[1]
+
+    offset = doc.html.index("Sample HTML")
+    assert doc.edit(offset, len("Sample"), "Edited") is title
+    assert doc.edit(offset, 0, "<b>Really</b> ") is title
+
+    body = doc.html.index("This is")
+    for i, char in enumerate("New text "):
+        doc.edit(body + i, 0, char)
+    doc.edit(body + i + 1, 0, "<i>here</i>")
+    doc.edit(doc.html.index('<div class="footer">'), 0, "<p>before footer</p>")
+    doc.edit(doc.html.index("<p>Paragraph"), len("<p>Paragraph"), "")
+
+    assert spans(doc.root) == spans(parse_html(doc.html))
+    assert "".join(title.content()) == " Edited HTML"
+
+
+def test_unbalanced_edits(load_sample_html):
+    doc = Document(load_sample_html)
+
+    # the structure around the edit changes
+    doc.edit(doc.html.index("</h1>"), len("</h1>"), "")
+    assert spans(doc.root) == spans(parse_html(doc.html))
+    doc.edit(doc.html.index("<b>"), 0, "</p>")
+    assert spans(doc.root) == spans(parse_html(doc.html))
+
+    html = doc.html
+    with pytest.raises(RuntimeError):
+        doc.edit(html.index("bold"), 0, "<")
+    assert doc.html == html
+    with pytest.raises(ValueError):
+        doc.edit(len(html), 1, "")
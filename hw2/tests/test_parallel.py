@@ -0,0 +1,46 @@
+"""
+Unit-tests for parsing many documents in parallel
+"""
+import pytest
+
+from utils.parallel import parse_many
+from utils.parser import parse_html
+
+
+def count_tags(root):
+    return sum(1 for _ in root.subtags())
+
+
+@pytest.fixture()
+def make_documents():
+    return [f"<div>{i}</div>" * (i % 5) + f"<p>{i}</p>" for i in range(50)]
+
+
+@pytest.mark.parametrize("workers", (0, 2))
+def test_parse_many(make_documents, workers):
+    trees = parse_many(make_documents, workers=workers, chunk_size=8)
+
+    for html, tree in zip(make_documents, trees):
+        assert tree.root.to_tag() == parse_html(html)
+
+
+@pytest.mark.parametrize("workers", (0, 2))
+def test_parse_many_callback(make_documents, workers, tmp_path):
+    paths = []
+    for i, html in enumerate(make_documents):
+        paths.append(tmp_path / f"{i}.html")
+        paths[-1].write_text(html)
+
+    expected = [count_tags(parse_html(html)) for html in make_documents]
+    assert list(parse_many(make_documents, workers, 8, count_tags)) == expected
+    assert list(parse_many(paths, workers, 8, count_tags)) == expected
+    # the files are parsed into the trees as well
+    trees = parse_many(paths, workers, 8)
+    assert [count_tags(tree.root) for tree in trees] == expected
+
+
+def test_parse_many_errors():
+    with pytest.raises(ValueError):
+        list(parse_many(["<p></p>"], chunk_size=0))
+    with pytest.raises(RuntimeError):
+        list(parse_many(["<p></p>", "<p>x < y</p>"], workers=2, chunk_size=1))
@@ -1,9 +1,13 @@
 """
 Unit-tests for HTML parser implementation
 """
+from io import StringIO
+
 import pytest
 
-from utils.parser import parse_html, Tag
+from utils.parser import parse_html, parse_html_file, parse_stream, iter_stream_events
+from utils.parser import extract_text, ParseStats
+from utils.parser import Tag, TextSpan, OPEN, CONTENT, CLOSE
 
 
 @pytest.fixture()
@@ -16,13 +20,6 @@ def make_simple_text():
     return {"div_text": "some div text", "p_text": "para text", "bold_text": "bold boi"}
 
 
-@pytest.fixture()
-def load_sample_html():
-    with open("data/test_index.html") as file:
-        html = file.read()
-    return html
-
-
 def test_parser(mocker, make_simple_html_string, make_simple_text):
     formatted_html = make_simple_html_string.format(**make_simple_text)
     root = parse_html(formatted_html)
@@ -54,3 +51,210 @@ def test_parser_on_sample_html(mocker, load_sample_html):
     assert on_begin_stub.call_count > 1
     assert on_end_stub.call_count > 1
     assert on_content_stub.call_count > 1
+
+
+def test_parser_tree(make_simple_html_string, make_simple_text):
+    formatted_html = make_simple_html_string.format(**make_simple_text)
+    root = parse_html(formatted_html)
+
+    div, bold = Tag("div"), Tag("b")
+    para = Tag("p")
+    para.add_item(make_simple_text["p_text"])
+    div.add_item(make_simple_text["div_text"])
+    div.add_item(para)
+    bold.add_item(make_simple_text["bold_text"])
+
+    expected = Tag("root")
+    expected.add_item(div)
+    expected.add_item(bold)
+
+    assert root == expected
+
+
+def test_parser_errors():
+    with pytest.raises(TypeError):
+        parse_html(b"<div></div>")
+
+    with pytest.raises(RuntimeError) as exc_info:
+        parse_html("<div>x < y</div>")
+
+    assert "< y</div>" in str(exc_info.value)
+
+
+def test_iter_events(make_simple_html_string, make_simple_text):
+    formatted_html = make_simple_html_string.format(**make_simple_text)
+    root = parse_html(formatted_html)
+
+    assert list(root.iter_events(skip_root=True)) == [
+        (OPEN, "div"),
+        (OPEN, "p"),
+        (CONTENT, make_simple_text["p_text"]),
+        (CLOSE, "p"),
+        (CONTENT, make_simple_text["div_text"]),
+        (CLOSE, "div"),
+        (OPEN, "b"),
+        (CONTENT, make_simple_text["bold_text"]),
+        (CLOSE, "b"),
+    ]
+
+    events = list(root.iter_events())
+    assert events[0] == (OPEN, "root") and events[-1] == (CLOSE, "root")
+
+
+def test_deep_nesting(mocker):
+    depth = 10_000
+    html = "<div>" * depth + "text" + "</div>" * depth
+    root = parse_html(html)
+
+    on_begin_stub = mocker.stub(name="begin_stub")
+    on_end_stub = mocker.stub(name="end_stub")
+    on_content_stub = mocker.stub(name="content_stub")
+
+    root.describe(on_begin_stub, on_end_stub, on_content_stub, skip_root=True)
+
+    assert on_begin_stub.call_count == depth
+    assert on_end_stub.call_count == depth
+    assert on_content_stub.call_count == depth
+
+
+@pytest.mark.parametrize("chunk_size", (1, 5, 1 << 16))
+def test_stream_events(load_sample_html, chunk_size):
+    root = parse_html(load_sample_html)
+
+    for skip_root in (True, False):
+        events = iter_stream_events(
+            StringIO(load_sample_html), skip_root=skip_root, chunk_size=chunk_size
+        )
+        assert list(events) == list(root.iter_events(skip_root=skip_root))
+
+
+def test_parse_stream(mocker, make_simple_html_string, make_simple_text):
+    formatted_html = make_simple_html_string.format(**make_simple_text)
+    # the tokens are split between the chunks
+    chunks = (formatted_html[i : i + 4] for i in range(0, len(formatted_html), 4))
+
+    on_begin_stub = mocker.stub(name="begin_stub")
+    on_end_stub = mocker.stub(name="end_stub")
+    on_content_stub = mocker.stub(name="content_stub")
+
+    parse_stream(chunks, on_begin_stub, on_end_stub, on_content_stub, skip_root=True)
+
+    assert on_begin_stub.call_count == 3
+    assert on_end_stub.call_count == 3
+    on_content_stub.assert_any_call(make_simple_text["div_text"])
+
+
+def test_stream_errors():
+    with pytest.raises(RuntimeError):
+        list(iter_stream_events(StringIO("<div>x < y</div>")))
+
+    # the tag is never finished
+    with pytest.raises(RuntimeError):
+        list(iter_stream_events(StringIO("<div>text<p"), chunk_size=2))
+
+
+def test_tag_attrs():
+    root = parse_html('<!DOCTYPE html><a href="/" class=\'x y\' HIDDEN>link</a><br/>')
+    # there are no void tags, the rest of the document is inside the doctype
+    doctype, = root.subtags()
+    link, br = doctype.subtags()
+
+    assert (doctype.name, doctype.attrs) == ("!DOCTYPE", {"html": ""})
+    assert link.name == "a"
+    assert link.raw_attrs == ' href="/" class=\'x y\' HIDDEN'
+    assert link.attrs == {"href": "/", "class": "x y", "hidden": ""}
+    # the attributes are parsed once
+    assert link.attrs is link.attrs
+    assert br.name == "br" and br.attrs == {}
+
+
+def test_tag_equality():
+    html = '<div id="x"><a href="/x">text</a></div>'
+    assert parse_html(html) == parse_html(html)
+    # the trees differ in an attribute only
+    assert parse_html(html) != parse_html(html.replace("/x", "/y"))
+    assert parse_html(html) != parse_html(html.replace(' id="x"', ""))
+    # the same attributes written differently
+    assert parse_html(html) == parse_html(html.replace('href="/x"', "HREF='/x'"))
+    assert parse_html(html) != parse_html(html.replace("text", "txt"))
+
+
+def test_parse_html_file(tmp_path, load_sample_html):
+    html = load_sample_html + "<p>Привет, мир!</p>"
+    path = tmp_path / "index.html"
+    path.write_text(html, encoding="utf-8")
+
+    root = parse_html_file(str(path))
+    assert root == parse_html(html)
+    assert list(root.iter_events()) == list(parse_html(html).iter_events())
+
+    *_, para = root.subtags()
+    text, = para.children
+    assert isinstance(text, TextSpan)
+    assert str(text) == "Привет, мир!"
+
+    empty = tmp_path / "empty.html"
+    empty.write_text("")
+    assert parse_html_file(str(empty)) == Tag("root")
+
+    broken = tmp_path / "broken.html"
+    broken.write_text("<div>x < y</div>")
+    with pytest.raises(RuntimeError):
+        parse_html_file(str(broken))
+
+
+def test_extract_text(load_sample_html):
+    html = (
+        "<div>\n  <p>one <b>two</b></p>\n"
+        "<SCRIPT>var x = 1;<b>not text</b></SCRIPT><style>p {}</style> three</div>"
+    )
+    assert extract_text(html) == "one two three"
+    assert extract_text(html, skip_tags=()) == "one twovar x = 1;not textp {} three"
+    assert extract_text(html, separator="|") == "one |two| three"
+    # the text after the closing tag on the top level is ignored
+    assert extract_text("<p>a</p></div>b") == "a"
+
+    expected = []
+    parse_html(load_sample_html).describe(
+        lambda _: None, lambda _: None, lambda text: expected.append(text.strip())
+    )
+    words = extract_text(load_sample_html, separator=" ").split()
+    assert sorted(words) == sorted(" ".join(expected).split())
+
+    with pytest.raises(TypeError):
+        extract_text(b"<p></p>")
+    with pytest.raises(RuntimeError):
+        extract_text("<div>x < y</div>")
+
+
+def test_parse_stats(tmp_path, load_sample_html):
+    stats = ParseStats()
+    root = parse_html(load_sample_html, stats=stats)
+
+    assert root == parse_html(load_sample_html)
+    assert stats.tokens["open"] == stats.tokens["close"] == 10
+    # the data tokens are tried after both of the tags
+    assert stats.failed_matches == dict(
+        open=stats.tokens["close"] + stats.tokens["data"],
+        close=stats.tokens["data"],
+        data=0,
+    )
+    assert stats.bytes_consumed == len(load_sample_html)
+    assert stats.max_depth == 4
+    assert set(stats.timings) == {"tokenize", "build"}
+
+    # the text after the closing tag on the top level is not consumed
+    stats = ParseStats()
+    parse_html("<p>a</p></div>b", stats=stats)
+    assert stats.bytes_consumed == len("<p>a</p></div>")
+
+    stats = ParseStats()
+    with pytest.raises(RuntimeError):
+        parse_html("<div>x < y</div>", stats=stats)
+    assert stats.failed_matches == dict(open=2, close=2, data=1)
+
+    path = tmp_path / "index.html"
+    path.write_text(load_sample_html)
+    stats = ParseStats()
+    assert parse_html_file(str(path), stats=stats) == root
+    assert stats.bytes_consumed == len(load_sample_html.encode())
@@ -0,0 +1,57 @@
+"""
+Unit-tests for indexed queries over the tag tree
+"""
+import pytest
+
+from utils.parser import parse_html
+from utils.query import QueryIndex, parse_selector
+
+
+@pytest.fixture()
+def make_links_html():
+    return (
+        '<div class="menu top"><a href="/">home</a><p><a href="/about">about</a></p></div>'
+        '<div id="main"><a>plain</a><p class="menu">text</p></div>'
+    )
+
+
+def test_index_on_sample_html(load_sample_html):
+    index = QueryIndex(parse_html(load_sample_html))
+
+    assert [tag.attrs for tag in index.by_name("div")] == [
+        {"class": "block"}, {"class": "footer"}
+    ]
+    assert index.select_one("body > div.footer").attrs == {"class": "footer"}
+    assert list(index.select("head div")) == []
+    assert len(list(index.select("html *"))) == len(index) - 1
+
+
+def test_selectors(make_links_html):
+    index = QueryIndex(parse_html(make_links_html))
+    text = lambda selector: ["".join(tag.content()) for tag in index.select(selector)]
+
+    assert text("a") == ["home", "about", "plain"]
+    assert text("div.menu a") == ["home", "about"]
+    assert text("div.menu > a") == ["home"]
+    assert text(".top p > a[href='/about']") == ["about"]
+    assert text("#main > .menu") == ["text"]
+    assert text("a[href]") == ["home", "about"]
+    assert text("p a") == ["about"]
+    assert text("div p.menu") == ["text"]
+
+
+def test_ancestors(make_links_html):
+    index = QueryIndex(parse_html(make_links_html))
+    home, about, plain = index.index[("name", "a")]
+    div = index.index[("name", "div")][0]
+
+    assert index.is_ancestor(0, plain)
+    assert index.is_ancestor(div, about)
+    assert not index.is_ancestor(div, plain)
+    assert not index.is_ancestor(home, about)
+
+
+def test_selector_errors():
+    for selector in ("", "div >", "> a", "div > > a", "a[href", "div{}"):
+        with pytest.raises(ValueError):
+            parse_selector(selector)
@@ -0,0 +1,71 @@
+"""
+Unit-tests for the binary format of the tag tree
+"""
+import pytest
+
+from utils.dom import parse_compact
+from utils.parser import OPEN, parse_html
+from utils.serialize import MappedTree, dump, dumps, load, loads
+
+
+@pytest.fixture()
+def load_sample_html(load_sample_html):
+    # the sample with some non-ASCII text and attributes
+    return load_sample_html + '<p class="greeting">Привет, мир!</p>'
+
+
+def test_roundtrip(load_sample_html):
+    root = parse_html(load_sample_html)
+
+    for tree in (parse_compact(load_sample_html), root):
+        loaded = loads(dumps(tree))
+        assert loaded.root.to_tag() == root
+        assert list(loaded.iter_events()) == list(root.iter_events())
+
+    *_, para = loads(dumps(root)).root.subtags()
+    assert para.attrs == {"class": "greeting"}
+    assert list(para.content()) == ["Привет, мир!"]
+
+
+def test_load_errors(load_sample_html):
+    data = dumps(parse_compact(load_sample_html))
+
+    with pytest.raises(ValueError):
+        loads(b"HTML" + data[4:])
+    with pytest.raises(ValueError):
+        loads(data[:-1])
+    with pytest.raises(ValueError):
+        loads(b"")
+
+
+def test_mapped_tree(mocker, tmp_path, load_sample_html):
+    root = parse_html(load_sample_html)
+    path = str(tmp_path / "index.htmt")
+    dump(root, path)
+
+    with load(path) as tree:
+        assert isinstance(tree, MappedTree)
+        assert list(tree.iter_events(skip_root=True)) == list(root.iter_events(True))
+
+        on_begin_stub = mocker.stub(name="begin_stub")
+        on_end_stub = mocker.stub(name="end_stub")
+        on_content_stub = mocker.stub(name="content_stub")
+        tree.root.describe(on_begin_stub, on_end_stub, on_content_stub)
+
+        tags = sum(1 for event, _ in root.iter_events() if event == OPEN)
+        assert on_begin_stub.call_count == tags
+        on_content_stub.assert_any_call("Привет, мир!")
+
+    # the file is unmapped
+    assert tree.buffer.closed
+
+
+def test_mapped_tree_errors(tmp_path):
+    empty = tmp_path / "empty.htmt"
+    empty.write_bytes(b"")
+    junk = tmp_path / "junk.htmt"
+    junk.write_bytes(b"<html></html>" * 10)
+
+    for path in (empty, junk):
+        with pytest.raises(ValueError):
+            load(str(path))
@@ -0,0 +1,73 @@
+"""
+Unit-tests for the serializer of the tag tree
+"""
+import io
+
+import pytest
+
+from utils.parser import parse_html
+from utils.writer import iter_html, to_html, write_to
+
+
+@pytest.fixture()
+def load_sample_html(load_sample_html):
+    # the sample with some non-ASCII text and attributes
+    return load_sample_html + '<p class="greeting">Привет, мир!</p>'
+
+
+def test_roundtrip(load_sample_html):
+    root = parse_html(load_sample_html)
+    html = to_html(root)
+    assert html == load_sample_html
+    assert parse_html(html) == root
+
+    *_, para = parse_html(html).subtags()
+    assert para.attrs == {"class": "greeting"}
+
+
+def test_unclosed_tags():
+    root = parse_html("<div><p>one<br>two</div>")
+    html = to_html(root)
+    assert html == "<div><p>one<br>two</br></p></div>"
+    assert parse_html(html) == root
+
+
+def test_skip_root():
+    root = parse_html("<b>bold</b>")
+    assert to_html(root, skip_root=False) == "<root><b>bold</b></root>"
+    assert to_html(root, pretty=True, skip_root=False) == (
+        "<root>\n  <b>\n    bold\n  </b>\n</root>\n"
+    )
+
+
+def test_pretty():
+    root = parse_html('<ul id="list">\n  <li>one</li><li> two </li>\n</ul>')
+    assert to_html(root, pretty=True, indent="\t") == (
+        '<ul id="list">\n\t<li>\n\t\tone\n\t</li>\n\t<li>\n\t\ttwo\n\t</li>\n</ul>\n'
+    )
+
+
+def test_deep_tree():
+    depth = 10 ** 4
+    html = "<i>" * depth + "text" + "</i>" * depth
+    assert to_html(parse_html(html)) == html
+
+
+@pytest.mark.parametrize("chunk_size", [1, 16, 1 << 16])
+def test_write_to(load_sample_html, chunk_size):
+    root = parse_html(load_sample_html)
+    stream = io.BytesIO()
+    written = write_to(root, stream, chunk_size=chunk_size)
+    data = stream.getvalue()
+    assert written == len(data)
+    assert data.decode("utf-8") == to_html(root)
+
+
+def test_write_to_chunks(mocker, load_sample_html):
+    root = parse_html(load_sample_html)
+    stream = mocker.Mock()
+    stream.write.side_effect = len
+    write_to(root, stream, pretty=True, chunk_size=64)
+    chunks = [call.args[0] for call in stream.write.call_args_list]
+    assert all(len(chunk) >= 64 for chunk in chunks[:-1])
+    assert b"".join(chunks).decode("utf-8") == "".join(iter_html(root, pretty=True))
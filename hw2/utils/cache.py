@@ -0,0 +1,125 @@
+"""
+Cache of the parsed documents keyed by the hash of their content
+
+The recently used trees are kept in memory, optionally the trees
+are also stored on disk (see `serialize`) to survive restarts
+"""
+
+from collections import OrderedDict
+import hashlib
+import os
+import tempfile
+from typing import Optional
+
+from .parser import Tag, parse_html
+from .serialize import dumps, loads
+
+SUFFIX = ".htmt"
+# each entry starts with the digest of the serialized tree
+DIGEST_SIZE = 16
+
+
+def content_key(html: str) -> str:
+    data = html.encode("utf-8", "surrogatepass")
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def _digest(payload: bytes) -> bytes:
+    return hashlib.blake2b(payload, digest_size=DIGEST_SIZE).digest()
+
+
+class ParseCache:
+    """
+    `parse_html` with the cache in front of it. The same tree is returned
+    for the same document while it is cached, thus the trees should not
+    be modified by the callers
+
+    Arguments:
+        `maxsize`: `int`, the number of trees kept in memory (LRU)
+        `directory`: `str` (optional), the directory of the on-disk store
+    """
+
+    def __init__(self, maxsize: int = 128, directory: Optional[str] = None) -> None:
+        if maxsize < 0: raise ValueError(f"Expected non-negative cache size: {maxsize}")
+        self.maxsize = maxsize
+        self.directory = directory
+        if directory is not None: os.makedirs(directory, exist_ok=True)
+        self.trees: "OrderedDict[str, Tag]" = OrderedDict()
+        self.hits = self.disk_hits = self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self.trees)
+
+    def info(self) -> dict:
+        return dict(
+            hits=self.hits,
+            disk_hits=self.disk_hits,
+            misses=self.misses,
+            size=len(self.trees),
+            maxsize=self.maxsize,
+        )
+
+    def clear(self) -> None:
+        # the on-disk store is kept
+        self.trees.clear()
+        self.hits = self.disk_hits = self.misses = 0
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key + SUFFIX)
+
+    def _load(self, key: str) -> Optional[Tag]:
+        if self.directory is None: return None
+        try:
+            with open(self._path(key), "rb") as file:
+                data = file.read()
+        except OSError:
+            return None
+        digest, payload = data[:DIGEST_SIZE], data[DIGEST_SIZE:]
+        # broken entries are parsed again (and written anew)
+        if digest != _digest(payload): return None
+        try:
+            return loads(payload).root.to_tag()
+        except Exception:
+            return None
+
+    def _store(self, key: str, root: Tag) -> None:
+        if self.directory is None: return
+        # the entry appears at once, a half-written file is never seen
+        fd, temp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            payload = dumps(root)
+            with os.fdopen(fd, "wb") as file:
+                file.write(_digest(payload))
+                file.write(payload)
+            os.replace(temp, self._path(key))
+        except OSError:
+            if os.path.exists(temp): os.remove(temp)
+
+    def _remember(self, key: str, root: Tag) -> None:
+        if not self.maxsize: return
+        self.trees[key] = root
+        if len(self.trees) > self.maxsize: self.trees.popitem(last=False)
+
+    def parse(self, html: str) -> Tag:
+        '''
+        Same as `parse_html`, the cached tree is returned if there is one
+        '''
+        if not isinstance(html, str): raise TypeError(f'Expected HTML string object')
+        key = content_key(html)
+
+        root = self.trees.get(key)
+        if root is not None:
+            self.hits += 1
+            self.trees.move_to_end(key)
+            return root
+
+        root = self._load(key)
+        if root is not None:
+            self.disk_hits += 1
+        else:
+            self.misses += 1
+            root = parse_html(html)
+            self._store(key, root)
+
+        self._remember(key, root)
+        return root
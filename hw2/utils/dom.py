@@ -0,0 +1,354 @@
+"""
+Compact array-backed representation of the tag tree
+
+Instead of an object per tag, the tree is stored in parallel
+columns (`array`s) indexed by node number, the text is kept
+as spans of the source document
+"""
+
+from array import array
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+from .parser import (
+    BYTES_TOKEN_REGEX,
+    CLOSE,
+    CONTENT,
+    OPEN,
+    TOKEN_REGEX,
+    Tag,
+    Tokenizer,
+    parse_attrs,
+)
+
+# kinds of the nodes
+TAG, TEXT = 0, 1
+# the index of the missing node (e.g. no children)
+NONE = -1
+ROOT_NAME = "root"
+
+
+class CompactTree:
+    """
+    Tag tree stored by columns, the node `0` is the root
+
+    Columns:
+        `parent`, `first_child`, `next_sibling`: indices of the nodes
+        `kind`: `TAG` or `TEXT`
+        `name_id`: index of the tag name in `names` (`NONE` for text)
+        `start`, `length`: the span of the text (or of the raw
+            attributes of the tag) in `source`
+
+    The columns may be any integer sequences (e.g. memoryviews),
+    `source` may be either `str` or bytes-like object (decoded on access)
+    """
+
+    def __init__(
+        self,
+        names: List[str],
+        source: Union[str, bytes, memoryview],
+        parent: Sequence[int],
+        first_child: Sequence[int],
+        next_sibling: Sequence[int],
+        kind: Sequence[int],
+        name_id: Sequence[int],
+        start: Sequence[int],
+        length: Sequence[int],
+        encoding: str = "utf-8",
+    ) -> None:
+        self.names = names
+        self.source = source
+        self.parent = parent
+        self.first_child = first_child
+        self.next_sibling = next_sibling
+        self.kind = kind
+        self.name_id = name_id
+        self.start = start
+        self.length = length
+        self.encoding = encoding
+        # the attributes of the tags parsed so far
+        self._attrs: Dict[int, dict] = {}
+
+    def __len__(self) -> int:
+        return len(self.kind)
+
+    @property
+    def root(self) -> "Node":
+        return Node(self, 0)
+
+    def nbytes(self) -> int:
+        # the memory taken by the columns
+        columns = (
+            self.parent,
+            self.first_child,
+            self.next_sibling,
+            self.kind,
+            self.name_id,
+            self.start,
+            self.length,
+        )
+        return sum(len(column) * column.itemsize for column in columns)
+
+    def name(self, node: int) -> Optional[str]:
+        name_id = self.name_id[node]
+        return None if name_id == NONE else self.names[name_id]
+
+    def text(self, node: int) -> str:
+        start = self.start[node]
+        text = self.source[start : start + self.length[node]]
+        return text if isinstance(text, str) else bytes(text).decode(self.encoding)
+
+    def attrs(self, node: int) -> dict:
+        attrs = self._attrs.get(node)
+        if attrs is None:
+            attrs = {} if self.kind[node] != TAG else parse_attrs(self.text(node))
+            self._attrs[node] = attrs
+        return attrs
+
+    def children(self, node: int) -> Iterator[int]:
+        child = self.first_child[node]
+        while child != NONE:
+            yield child
+            child = self.next_sibling[child]
+
+    def content(self, node: int) -> str:
+        # the plain text of the node (inner tags are skipped)
+        kind = self.kind
+        return "".join(
+            self.text(child) for child in self.children(node) if kind[child] == TEXT
+        )
+
+    def iter_events(self, node: int = 0, skip_root=False):
+        """
+        Same events as `Tag.iter_events` of the node
+        """
+        first_child, next_sibling, kind = self.first_child, self.next_sibling, self.kind
+
+        if not skip_root: yield OPEN, self.name(node)
+        # the nodes along with their first children which are not visited yet
+        stack = [[node, first_child[node]]]
+        while stack:
+            top = stack[-1]
+            child = top[1]
+            while child != NONE and kind[child] != TAG:
+                child = next_sibling[child]
+
+            if child != NONE:
+                top[1] = next_sibling[child]
+                yield OPEN, self.name(child)
+                stack.append([child, first_child[child]])
+                continue
+
+            stack.pop()
+            current = top[0]
+            if current == node and skip_root: continue
+            yield CONTENT, self.content(current)
+            yield CLOSE, self.name(current)
+
+    def to_tag(self, node: int = 0) -> Tag:
+        """
+        Materialize the subtree as `Tag` objects
+        """
+        root = Tag(self.name(node), self.text(node))
+        stack = [(node, root)]
+        while stack:
+            current, tag = stack.pop()
+            for child in self.children(current):
+                if self.kind[child] == TEXT:
+                    tag.children.append(self.text(child))
+                    continue
+                subtag = Tag(self.name(child), self.text(child))
+                tag.children.append(subtag)
+                stack.append((child, subtag))
+        return root
+
+
+class Node:
+    """
+    `Tag`-like view of a node of `CompactTree`
+    """
+
+    __slots__ = ("tree", "index")
+
+    def __init__(self, tree: CompactTree, index: int) -> None:
+        self.tree = tree
+        self.index = index
+
+    def __repr__(self) -> str:
+        return f"Node(name={self.name!r}, index={self.index})"
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Node): return NotImplemented
+        return self.tree is other.tree and self.index == other.index
+
+    def __hash__(self) -> int:
+        return hash((id(self.tree), self.index))
+
+    @property
+    def name(self) -> str:
+        return self.tree.name(self.index)
+
+    @property
+    def attrs(self) -> dict:
+        return self.tree.attrs(self.index)
+
+    @property
+    def parent(self) -> Optional["Node"]:
+        parent = self.tree.parent[self.index]
+        return None if parent == NONE else Node(self.tree, parent)
+
+    @property
+    def children(self) -> list:
+        tree = self.tree
+        return [
+            Node(tree, child) if tree.kind[child] == TAG else tree.text(child)
+            for child in tree.children(self.index)
+        ]
+
+    def subtags(self) -> Iterator["Node"]:
+        tree = self.tree
+        return (
+            Node(tree, child)
+            for child in tree.children(self.index)
+            if tree.kind[child] == TAG
+        )
+
+    def content(self) -> Iterator[str]:
+        tree = self.tree
+        return (
+            tree.text(child)
+            for child in tree.children(self.index)
+            if tree.kind[child] == TEXT
+        )
+
+    def iter_events(self, skip_root=False):
+        return self.tree.iter_events(self.index, skip_root)
+
+    def describe(self, on_open, on_close, on_content, skip_root=False):
+        callbacks = {OPEN: on_open, CONTENT: on_content, CLOSE: on_close}
+        for event, value in self.iter_events(skip_root):
+            callbacks[event](value)
+
+    def to_tag(self) -> Tag:
+        return self.tree.to_tag(self.index)
+
+
+class TreeBuilder:
+    """
+    Appends the nodes to the columns of a new `CompactTree`
+    """
+
+    def __init__(self) -> None:
+        self.names: List[str] = []
+        self.name_ids: Dict[str, int] = {}
+        self.parent = array("i")
+        self.first_child = array("i")
+        self.next_sibling = array("i")
+        self.kind = array("b")
+        self.name_id = array("i")
+        self.start = array("q")
+        self.length = array("q")
+        # the last child of each node, to link the next one to it
+        self.last_child = array("i")
+        self.add(NONE, TAG, ROOT_NAME)
+
+    def add(self, parent: int, kind: int, name: Optional[str], start=0, length=0):
+        node = len(self.kind)
+        if name is None:
+            name_id = NONE
+        else:
+            name_id = self.name_ids.get(name)
+            if name_id is None:
+                name_id = self.name_ids[name] = len(self.names)
+                self.names.append(name)
+
+        self.parent.append(parent)
+        self.first_child.append(NONE)
+        self.next_sibling.append(NONE)
+        self.last_child.append(NONE)
+        self.kind.append(kind)
+        self.name_id.append(name_id)
+        self.start.append(start)
+        self.length.append(length)
+
+        if parent != NONE:
+            last = self.last_child[parent]
+            if last == NONE: self.first_child[parent] = node
+            else: self.next_sibling[last] = node
+            self.last_child[parent] = node
+        return node
+
+    def build(self, source, encoding="utf-8") -> CompactTree:
+        return CompactTree(
+            self.names,
+            source,
+            self.parent,
+            self.first_child,
+            self.next_sibling,
+            self.kind,
+            self.name_id,
+            self.start,
+            self.length,
+            encoding,
+        )
+
+
+def parse_compact(html: Union[str, bytes, memoryview], encoding="utf-8"):
+    """
+    Parse HTML straight into `CompactTree`, no `Tag` objects are created
+    Arguments:
+        `html`: `str` or bytes-like object (e.g. `mmap`) to parse
+        `encoding`: `str`, the encoding of bytes
+    Returns:
+        `CompactTree`, the text is kept as the spans of `html`
+    Raises:
+        `RuntimeError` if parsing error is encountered
+    """
+    is_text = isinstance(html, str)
+    token_regex = TOKEN_REGEX if is_text else BYTES_TOKEN_REGEX
+    builder = TreeBuilder()
+    add = builder.add
+    stack = [0]
+
+    for match in Tokenizer(token_regex).tokens(html):
+        start, pos = match.span()
+        kind = match.lastgroup
+
+        if kind == "data":
+            add(stack[-1], TEXT, None, start, pos - start)
+        elif kind == "open":
+            name = match.group("tag_name")
+            if not is_text: name = name.decode(encoding)
+            start, stop = match.span("attrs")
+            stack.append(add(stack[-1], TAG, name, start, stop - start))
+        else:
+            stack.pop()
+
+    return builder.build(html, encoding)
+
+
+def from_tag(root: Tag) -> CompactTree:
+    """
+    Convert the tree of `Tag` objects, the text (and the raw
+    attributes) is copied into a single string the spans point to
+    """
+    builder = TreeBuilder()
+    builder.names[0] = root.name
+    builder.name_ids = {root.name: 0}
+    pieces: List[str] = []
+    offset = 0
+    stack: List[Tuple[Tag, int]] = [(root, 0)]
+
+    while stack:
+        tag, node = stack.pop()
+        for child in tag.children:
+            if isinstance(child, Tag):
+                text = child.raw_attrs
+                subtag = builder.add(node, TAG, child.name, offset, len(text))
+                stack.append((child, subtag))
+            else:
+                text = str(child)
+                builder.add(node, TEXT, None, offset, len(text))
+            pieces.append(text)
+            offset += len(text)
+
+    return builder.build("".join(pieces))
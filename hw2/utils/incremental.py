@@ -0,0 +1,171 @@
+"""
+Incremental re-parsing of the edited documents
+
+Only the part of the tree around the edit is parsed again: the smallest
+tag which content covers the edit is found by the spans of the tags,
+then its children between the untouched subtags are replaced
+"""
+
+from typing import List, Tuple
+
+from .parser import TOKEN_REGEX, Tag, _build_tree, _make_tag, _make_text, parse_html
+
+
+class Document:
+    """
+    HTML document along with its tag tree, kept in sync on edits
+
+    Arguments:
+        `html`: `str`, the source of the document
+    Raises:
+        `RuntimeError` if parsing error is encountered
+    """
+
+    def __init__(self, html: str) -> None:
+        self.html = html
+        self.root = parse_html(html)
+        # the subtags found on the path to the last edit along with their
+        # indices and starts, the next edits are likely to be nearby
+        self._fingers: List[Tuple[Tag, int, int]] = []
+
+    def edit(self, offset: int, removed: int, inserted: str) -> Tag:
+        '''
+        Replace `removed` characters at `offset` with `inserted` text
+        and update the tree, the tags outside of the edited region
+        are kept (their spans are shifted)
+
+        Returns:
+            `Tag` which children were parsed again (the root
+            if the whole document was parsed again)
+        Raises:
+            `ValueError` if the edit is out of the document
+            `RuntimeError` if parsing error is encountered
+        '''
+        if not isinstance(inserted, str): raise TypeError(f'Expected string to insert')
+        if offset < 0 or removed < 0 or offset + removed > len(self.html):
+            raise ValueError(f"The edit is out of the document: {offset}, {removed}")
+
+        html = self.html[:offset] + inserted + self.html[offset + removed :]
+        delta, edit_end = len(inserted) - removed, offset + removed
+        root = self.root
+
+        # the text after the closing tag on the top level is not parsed anyway
+        if root.inner_end < root.length <= offset:
+            self.html = html
+            return root
+
+        # the tags down to the smallest one which content
+        # covers the edit, along with their starts
+        path: List[Tuple[Tag, int]] = []
+        fingers: List[Tuple[Tag, int, int]] = []
+        found = (root, 0) if root.inner <= offset <= edit_end <= root.inner_end else None
+        while found is not None:
+            path.append(found)
+            tag, start = found
+            hint = None
+            if len(self._fingers) > len(fingers):
+                finger = self._fingers[len(fingers)]
+                if finger[0] is tag: hint = finger[1:]
+            found = _find_child(tag, start, offset, edit_end, hint)
+            if found is None: break
+            i, child_start = found
+            fingers.append((tag, i, child_start))
+            found = tag.children[i], child_start
+
+        # if the region is unbalanced after the edit,
+        # the region in the parent is tried instead
+        for depth in range(len(path) - 1, -1, -1):
+            tag, start = path[depth]
+            spliced = self._splice(tag, start, html, offset, edit_end, delta)
+            if not spliced: continue
+
+            for parent, _ in path[:depth]:
+                _shift(parent, delta)
+            # the children of the spliced tag are new
+            self._fingers = fingers[:depth]
+            self.html = html
+            return tag
+
+        self.root = parse_html(html)
+        self.html = html
+        self._fingers = []
+        return self.root
+
+    def _splice(
+        self, tag: Tag, start: int, html: str, offset: int, edit_end: int, delta: int
+    ) -> bool:
+        # the subtags entirely before and after the edit are kept
+        children = tag.children
+        lo, base, child_end = 0, start, start
+        hi, region_end = len(children), start + tag.inner_end
+        for i, child in enumerate(children):
+            if not isinstance(child, Tag): continue
+            child_start = child_end + child.offset
+            if child_start >= edit_end:
+                hi, region_end = i, child_start
+                break
+            child_end = child_start + child.length
+            if child_end <= offset: lo, base = i + 1, child_end
+        region_start = base if lo else start + tag.inner
+
+        fragment = Tag(tag.name)
+        try:
+            _, stack = _build_tree(
+                fragment, html, TOKEN_REGEX, _make_tag, _make_text,
+                region_start, region_end + delta, origin=base,
+            )
+        except RuntimeError:
+            return False
+        if len(stack) != 1: return False
+
+        # the first subtag after the region is relative to the last new one
+        for child in fragment.children:
+            if isinstance(child, Tag): base += child.offset + child.length
+        for child in children[hi:]:
+            if isinstance(child, Tag):
+                child.offset = region_end + delta - base
+                break
+
+        children[lo:hi] = fragment.children
+        _shift(tag, delta)
+        return True
+
+
+def _find_child(tag: Tag, start: int, offset: int, edit_end: int, hint=None):
+    '''
+    Find the subtag which content covers the edit
+    Arguments:
+        `hint`: (optional) the index and the start of a subtag
+            the search starts from (the subtags are found by their
+            offsets relative to each other, in both directions)
+    Returns: the index and the start of the subtag or `None`
+    '''
+    children = tag.children
+    first, child_end = 0, start
+    if hint is not None:
+        i, child_start = hint
+        # the subtags after the edit are stepped over backwards
+        while child_start > offset:
+            child_end = child_start - children[i].offset
+            i -= 1
+            while i >= 0 and not isinstance(children[i], Tag): i -= 1
+            if i < 0: break
+            child_start = child_end - children[i].length
+        if i >= 0: first, child_end = i, child_start - children[i].offset
+
+    for i in range(first, len(children)):
+        child = children[i]
+        if not isinstance(child, Tag): continue
+        child_start = child_end + child.offset
+        if child_start > offset: return None
+        if child_start + child.inner <= offset and edit_end <= child_start + child.inner_end:
+            return i, child_start
+        child_end = child_start + child.length
+    return None
+
+
+def _shift(tag: Tag, delta: int) -> None:
+    # the content of the tag has changed in size, the offsets of
+    # the subtags are relative to each other, thus they are kept
+    tag.inner_end += delta
+    tag.length += delta
@@ -0,0 +1,92 @@
+"""
+Parsing many documents at once in a pool of processes
+
+The documents are sent to the workers in chunks, the trees
+are sent back serialized (see `serialize`), unless a callback
+is given: then only its results leave the workers
+"""
+
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+import os
+from typing import Callable, Iterable, Iterator, List, Optional
+
+from .dom import parse_compact
+from .parser import parse_html, parse_html_file
+from .serialize import dumps, loads
+
+
+def _parse_one(doc, callback: Optional[Callable]):
+    # the paths are told apart from the documents by their type
+    if isinstance(doc, os.PathLike):
+        if callback is not None: return callback(parse_html_file(os.fspath(doc)))
+        with open(doc, "rb") as file:
+            return parse_compact(file.read())
+    if callback is not None: return callback(parse_html(doc))
+    return parse_compact(doc)
+
+
+def parse_chunk(docs: List, callback: Optional[Callable] = None) -> List:
+    """
+    Parse a chunk of documents in a worker process
+    Returns: the results of the callback or the serialized trees
+    """
+    results = [_parse_one(doc, callback) for doc in docs]
+    return results if callback is not None else list(map(dumps, results))
+
+
+def parse_many(
+    docs_or_paths: Iterable,
+    workers: Optional[int] = None,
+    chunk_size: int = 64,
+    callback: Optional[Callable] = None,
+) -> Iterator:
+    """
+    Parse the documents in parallel, the results are yielded
+    in the order of the documents as soon as they are ready
+
+    Arguments:
+        `docs_or_paths`: iterable of HTML strings or paths (`os.PathLike`,
+            e.g. `pathlib.Path`) of the files, it is consumed lazily
+        `workers`: `int` (optional), the number of processes (defaults to
+            the number of CPUs), if 0, the documents are parsed in this process
+        `chunk_size`: `int`, the number of documents sent to a worker at once
+        `callback`: (optional) picklable function called in the workers
+            with the parsed `Tag` tree, its results are yielded instead
+    Returns:
+        iterator over the trees (`CompactTree`) or the results of the callback
+    Raises:
+        `ValueError` if the arguments are invalid
+        `RuntimeError` if parsing error is encountered
+    """
+    if chunk_size <= 0: raise ValueError(f"Expected positive chunk size: {chunk_size}")
+    if workers is not None and workers < 0:
+        raise ValueError(f"Expected non-negative number of workers: {workers}")
+
+    docs = iter(docs_or_paths)
+    chunks = iter(lambda: list(islice(docs, chunk_size)), [])
+
+    if workers == 0:
+        for chunk in chunks:
+            yield from (_parse_one(doc, callback) for doc in chunk)
+        return
+
+    # a few chunks per worker are in flight, the rest
+    # of the documents is not read ahead of time
+    window = 2 * (workers or os.cpu_count() or 1)
+    pending = deque()
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        try:
+            for chunk in islice(chunks, window):
+                pending.append(executor.submit(parse_chunk, chunk, callback))
+
+            while pending:
+                results = pending.popleft().result()
+                for chunk in islice(chunks, 1):
+                    pending.append(executor.submit(parse_chunk, chunk, callback))
+                yield from results if callback is not None else map(loads, results)
+        finally:
+            # the iteration may be stopped early
+            for future in pending: future.cancel()
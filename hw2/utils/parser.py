@@ -1,11 +1,15 @@
 """
-Simple recursive parser for HTML
+Simple parser for HTML
 using regular expressions
 """
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from abc import ABC
+import io
+import mmap
+import os
 import re
+from time import perf_counter
 
 
 class HTML(ABC):
@@ -15,6 +19,12 @@ class HTML(ABC):
     """
 
     OPEN_TAG_REGEX = r"^<([!a-zA-z][a-zA-z0-9\-\s=\"\{\}\(\),\.;'_/:@]*)>"
+    # the same opening tag with the name and the attributes captured apart
+    OPEN_TAG_PARTS_REGEX = (
+        r"^<(?P<tag_name>[!a-zA-z][a-zA-z0-9\-_:\.@]*)"
+        r"(?P<attrs>[a-zA-z0-9\-\s=\"\{\}\(\),\.;'_/:@]*)>"
+    )
+    ATTR_REGEX = r"""([^\s=/>]+)(?:\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s>]+)))?"""
     CLOSED_TAG_REGEX = r"^</([!a-zA-z][a-zA-z0-9\-\s=\"\{\}\(\),\.;'_/:@]*)>"
     DATA_REGEX = r"^([^<]+)"
     EXAMPLE = """
@@ -34,6 +44,69 @@ class HTML(ABC):
     """
 
 
+def _token_pattern(**patterns: str) -> str:
+    # the patterns are combined into alternation of named groups,
+    # the leading `^` is dropped as the match is anchored
+    # at the given position by `pattern.match(html, pos)` anyway
+    return "|".join(
+        f"(?P<{name}>{pattern.lstrip('^')})" for name, pattern in patterns.items()
+    )
+
+
+# events of the tag tree traversal
+OPEN, CONTENT, CLOSE = "open", "content", "close"
+
+# the order matters: the alternatives are tried one by one
+TOKEN_KINDS = ("open", "close", "data")
+TOKEN_PATTERN = _token_pattern(
+    open=HTML.OPEN_TAG_PARTS_REGEX, close=HTML.CLOSED_TAG_REGEX, data=HTML.DATA_REGEX
+)
+TOKEN_REGEX = re.compile(TOKEN_PATTERN)
+# the same tokens matched over raw bytes (e.g. memory-mapped files)
+BYTES_TOKEN_REGEX = re.compile(TOKEN_PATTERN.encode())
+ATTR_REGEX = re.compile(HTML.ATTR_REGEX)
+
+
+def parse_attrs(raw: str) -> dict:
+    '''
+    Parse the raw attributes of a tag (e.g. ` class="x" hidden`)
+    into a mapping, the keys are lowercased, the attributes
+    without a value are mapped to an empty string
+    '''
+    return {
+        key.lower(): dq or sq or bare for key, dq, sq, bare in ATTR_REGEX.findall(raw)
+    }
+
+
+class TextSpan:
+    """
+    Plain text of a document kept as a span of the source
+    buffer, the text is decoded each time it is accessed
+    """
+
+    __slots__ = ("source", "offset", "length", "encoding")
+
+    def __init__(self, source, offset: int, length: int, encoding="utf-8") -> None:
+        self.source = source
+        self.offset = offset
+        self.length = length
+        self.encoding = encoding
+
+    def __str__(self) -> str:
+        start = self.offset
+        return self.source[start : start + self.length].decode(self.encoding)
+
+    def __repr__(self) -> str:
+        return f"TextSpan(offset={self.offset}, length={self.length})"
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, (str, TextSpan)): return NotImplemented
+        return str(self) == str(other)
+
+    def __hash__(self) -> int:
+        return hash(str(self))
+
+
 @dataclass
 class Tag:
     """
@@ -44,12 +117,49 @@ class Tag:
     name: str
     children: list
 
-    def __init__(self, tag_name) -> None:
+    # the span of the tag in the source (set by the parser): `offset` is
+    # relative to the end of the previous subtag of the parent (or to the
+    # start of the parent), thus the edits shift the spans of few tags only;
+    # the rest are relative to the start of the tag: the content
+    # is `[inner, inner_end)`, the closing tag ends at `length`
+    offset = inner = inner_end = length = 0
+
+    def __init__(self, tag_name, raw_attrs="") -> None:
         self.name = tag_name
         self.children = []
+        # the attributes are parsed on the first access only
+        self.raw_attrs = raw_attrs
+        self._attrs = None
+
+    @property
+    def attrs(self) -> dict:
+        if self._attrs is None: self._attrs = parse_attrs(self.raw_attrs)
+        return self._attrs
+
+    def _same_attrs(self, other: "Tag") -> bool:
+        # the same raw attributes are equal without parsing them,
+        # otherwise they may differ in quotes, spaces or case of the keys
+        return self.raw_attrs == other.raw_attrs or self.attrs == other.attrs
+
+    def __eq__(self, other) -> bool:
+        '''
+        The tags are equal if their names, attributes and children are equal,
+        the trees are compared with an explicit stack (as deep as they are)
+        '''
+        if not isinstance(other, Tag): return NotImplemented
+        pairs = [(self, other)]
+        while pairs:
+            left, right = pairs.pop()
+            if left.name != right.name or len(left.children) != len(right.children):
+                return False
+            if not left._same_attrs(right): return False
+            for x, y in zip(left.children, right.children):
+                if isinstance(x, Tag) and isinstance(y, Tag): pairs.append((x, y))
+                elif isinstance(x, Tag) or isinstance(y, Tag) or x != y: return False
+        return True
 
     def add_item(self, subtag_or_content):
-        if type(subtag_or_content) not in (Tag, str):
+        if type(subtag_or_content) not in (Tag, str, TextSpan):
             raise TypeError(f'Expected Tag or string: {subtag_or_content}')
         self.children.append(subtag_or_content)
 
@@ -57,30 +167,154 @@ class Tag:
         return filter(lambda x: isinstance(x, Tag), self.children)
 
     def content(self):
-        return filter(lambda x: isinstance(x, str), self.children)
+        # text spans are decoded here
+        return map(str, filter(lambda x: not isinstance(x, Tag), self.children))
 
     def describe(self, on_open, on_close, on_content, skip_root=False):
         '''
-        Recursively traverses the tag tree.
+        Traverses the tag tree (depth-first, with an explicit stack).
 
         Arguments:
             `on_open`, `on_close`: callbacks, is called with tag's name as argument
             `on_content`: callback, is called with the tag's inner plain text as argument
             `skip_root`: `bool`, whether to trigger callbacks on self
         '''
-        if not skip_root: on_open(self.name)
-        for tag in self.subtags():
-            tag.describe(on_open, on_close, on_content)
-        content = "".join(self.content())
-        if not skip_root: on_content(content)
-        if not skip_root: on_close(self.name)
+        callbacks = {OPEN: on_open, CONTENT: on_content, CLOSE: on_close}
+        for event, value in self.iter_events(skip_root):
+            callbacks[event](value)
+
+    def iter_events(self, skip_root=False):
+        '''
+        Lazily walks the tag tree, yields the same events `describe` triggers
+        callbacks on, as `(event, value)` pairs: `(OPEN, name)` once the tag is
+        entered, then `(CONTENT, text)` and `(CLOSE, name)` after its subtags
+
+        Arguments:
+            `skip_root`: `bool`, whether to yield the events of self
+        '''
+        if not skip_root: yield OPEN, self.name
+        # each entry is a tag along with the iterator
+        # over its children which are not visited yet
+        stack = [(self, iter(self.children))]
+        while stack:
+            tag, children = stack[-1]
+            for child in children:
+                if isinstance(child, Tag):
+                    yield OPEN, child.name
+                    stack.append((child, iter(child.children)))
+                    break
+            else:
+                stack.pop()
+                if tag is self and skip_root: continue
+                yield CONTENT, "".join(tag.content())
+                yield CLOSE, tag.name
 
 
-def parse_html(html: str):
+@dataclass
+class ParseStats:
+    """
+    Statistics of parsing, filled in by the parser if passed to it
+
+    Attributes:
+        `tokens`: the number of the matched tokens by their kinds
+        `failed_matches`: the number of times each of the token
+            regexes failed before the next one matched
+        `bytes_consumed`: the size of the parsed part of the source
+            (characters for the strings)
+        `max_depth`: the maximum nesting depth of the tags
+        `timings`: seconds spent on the phases (`tokenize`, `build`)
+    """
+
+    tokens: dict = field(default_factory=lambda: dict.fromkeys(TOKEN_KINDS, 0))
+    failed_matches: dict = field(default_factory=lambda: dict.fromkeys(TOKEN_KINDS, 0))
+    bytes_consumed: int = 0
+    max_depth: int = 0
+    timings: dict = field(default_factory=lambda: dict(tokenize=0.0, build=0.0))
+
+
+class Tokenizer:
+    """
+    Matches the tokens of HTML one after another, the only place which
+    tells where the document ends: the closing tag on the top level ends it
+    (the tags left open are closed by the end of the source)
+
+    Arguments:
+        `token_regex`: compiled `TOKEN_PATTERN` (`TOKEN_REGEX` or `BYTES_TOKEN_REGEX`)
+        `stats`: `ParseStats` (optional), updated with the tokens matched
+    Attributes (updated once the tokens of the source are exhausted):
+        `pos`: the position the tokenization stopped at
+        `depth`: the number of the open tags
+        `finished`: whether the closing tag on the top level was matched
+    """
+
+    def __init__(self, token_regex: re.Pattern = TOKEN_REGEX, stats: ParseStats = None):
+        self.token_regex = token_regex
+        self.stats = stats
+        self.pos = self.depth = 0
+        self.finished = False
+
+    def tokens(self, source, pos: int = 0, end=None, partial=False):
+        '''
+        Lazily yields the matches of the tokens of the source (`str` or bytes-like
+        object) in `[pos, end)`, the kind of a token is `match.lastgroup`
+
+        Arguments:
+            `partial`: `bool`, whether the rest of the source is to come (`str`
+                only): the tag cut off at the end is left for the next call
+        Raises:
+            `RuntimeError` if parsing error is encountered
+        '''
+        end = len(source) if end is None else end
+        match_token, stats = self.token_regex.match, self.stats
+        depth, first, tokenizing = self.depth, pos, 0.0
+
+        try:
+            while pos < end and not self.finished:
+                if stats is not None: matched = perf_counter()
+                match = match_token(source, pos, end)
+                if stats is not None:
+                    tokenizing += perf_counter() - matched
+                    self._count(match, depth)
+                if not match:
+                    if partial and source.find('>', pos, end) < 0: break
+                    rest = source[pos:end]
+                    if not isinstance(rest, str): rest = bytes(rest).decode(errors='replace')
+                    raise RuntimeError(f"Parsing Error: {rest}")
+                pos = match.end()
+                kind = match.lastgroup
+
+                if kind == 'open':
+                    depth += 1
+                elif kind == 'close':
+                    depth -= 1
+                    # the closing tag on the top level ends the document
+                    if depth < 0: self.finished = True
+                yield match
+        finally:
+            self.pos, self.depth = pos, depth
+            if stats is not None:
+                stats.bytes_consumed += pos - first
+                stats.timings['tokenize'] += tokenizing
+
+    def _count(self, match, depth: int) -> None:
+        # the alternatives before the matched one have
+        # failed (every one if nothing has matched)
+        stats = self.stats
+        kind = match.lastgroup if match else None
+        for other in TOKEN_KINDS:
+            if other == kind: break
+            stats.failed_matches[other] += 1
+        if kind is None: return
+        stats.tokens[kind] += 1
+        if kind == 'open' and depth >= stats.max_depth: stats.max_depth = depth + 1
+
+
+def parse_html(html: str, stats: ParseStats = None):
     '''
-    Parse given html string (in a recursive manner)
+    Parse given html string (in a single pass, with an explicit stack of open tags)
     Arguments:
         `html`: `str`, string to parse
+        `stats`: `ParseStats` (optional), filled in while parsing
     Returns:
         `Tag` object with root of the DOM tree
     Raises:
@@ -89,46 +323,234 @@ def parse_html(html: str):
     '''
     if not isinstance(html, str): raise TypeError(f'Expected HTML string object')
 
-    open_tag_regex, closed_tag_regex, content_regex = map(
-        re.compile,
-        (HTML.OPEN_TAG_REGEX, HTML.CLOSED_TAG_REGEX, HTML.DATA_REGEX),
-    )
+    root = Tag('root')
+    _build_tree(root, html, TOKEN_REGEX, _make_tag, _make_text, stats=stats)
+    return root
 
-    # helper function to fetch pattern
-    # from the current html string
-    # and cut the matched slice out of it
-    def pull(pattern: re.Pattern, handler) -> bool:
-        nonlocal html
-        match = pattern.match(html)
-        if not match: return False
-        html = html[match.end() :]
-        handler(match.group())
-        return True
 
-    def parse_content(node: Tag):
-        nonlocal html
-        found_close_tag = False
+def _make_tag(match: re.Match) -> Tag:
+    return Tag(match.group('tag_name'), match.group('attrs'))
+
+
+def _make_text(match: re.Match) -> str:
+    return match.group()
+
 
-        def open_tag_handler(tag):
-            new_tag = Tag(tag)
-            node.add_item(new_tag)
-            parse_content(new_tag)
+def _build_tree(
+    root: Tag, source, token_regex: re.Pattern, make_tag, make_text,
+    pos: int = 0, end=None, origin: int = 0, stats: ParseStats = None,
+):
+    '''
+    Tokenize the source (`str` or bytes-like object) and put
+    the tags (made by `make_tag`) and the text (by `make_text`)
+    into the tree under the `root`, the tags get their spans
 
-        def closed_tag_handler(tag):
-            nonlocal found_close_tag
-            found_close_tag = True
+    Arguments:
+        `pos`, `end`: the range of the source to tokenize
+        `origin`: the position in the source the root starts at
+            (the offset of its first subtag is relative to it)
+        `stats`: `ParseStats` (optional), updated on the way: the time
+            spent on matching the tokens is counted as tokenizing,
+            the rest is counted as building the tree
+    Returns:
+        the position tokenization stopped at and the tags left open
+        (none if the root was closed by a closing tag on the top level)
+    '''
+    # the tags which are not closed yet, the innermost is the last one
+    stack = [root]
+    starts = [origin]
+    # the positions the offsets of the next subtags are relative to
+    bases = [origin]
+    tokenizer = Tokenizer(token_regex, stats)
+    if stats is not None: started, tokenized = perf_counter(), stats.timings['tokenize']
 
-        def content_handler(content):
-            node.add_item(content)
+    try:
+        for match in tokenizer.tokens(source, pos, end):
+            start, pos = match.span()
+            kind = match.lastgroup
 
-        while not found_close_tag and html:
-            if not (
-                pull(open_tag_regex, open_tag_handler)
-                or pull(closed_tag_regex, closed_tag_handler)
-                or pull(content_regex, content_handler)
-            ):
-                raise RuntimeError(f"Parsing Error: {html}")
+            if kind == 'data':
+                stack[-1].children.append(make_text(match))
+            elif kind == 'open':
+                tag = make_tag(match)
+                tag.offset, tag.inner = start - bases[-1], pos - start
+                stack[-1].children.append(tag)
+                stack.append(tag)
+                starts.append(start)
+                bases.append(start)
+            else:
+                tag, tag_start = stack.pop(), starts.pop()
+                tag.inner_end, tag.length = start - tag_start, pos - tag_start
+                bases.pop()
+                if stack: bases[-1] = pos
+    finally:
+        # the time of matching the tokens is summed up by the
+        # tokenizer, the rest is spent on building the tree
+        if stats is not None:
+            tokenizing = stats.timings['tokenize'] - tokenized
+            stats.timings['build'] += perf_counter() - started - tokenizing
 
+    # the tags left open are closed by the end of the source
+    pos = tokenizer.pos
+    for tag, tag_start in zip(stack, starts):
+        tag.inner_end = tag.length = pos - tag_start
+    return pos, stack
+
+
+def extract_text(html: str, skip_tags=("script", "style"), separator: str = ""):
+    '''
+    Extract the plain text of the document without building the tag tree:
+    the text is written to the output buffer as the tokens are matched,
+    the whitespace-only text is skipped
+    Arguments:
+        `html`: `str`, string to parse
+        `skip_tags`: the names of the tags which contents are skipped
+            (lowercase), `script` and `style` by default
+        `separator`: `str`, written between the pieces of the text
+    Returns:
+        `str`, the text in the document order
+    Raises:
+        `TypeError` if not a string was given
+        `RuntimeError` if parsing error is encountered
+    '''
+    if not isinstance(html, str): raise TypeError(f'Expected HTML string object')
+
+    buffer = io.StringIO()
+    write = buffer.write
+    skip_tags = frozenset(skip_tags)
+    # the depth of the open tags and the one of the skipped tag (if any)
+    depth, skipped = 0, -1
+
+    for match in Tokenizer().tokens(html):
+        kind = match.lastgroup
+
+        if kind == 'data':
+            if skipped >= 0: continue
+            text = match.group()
+            if text.isspace(): continue
+            if separator and buffer.tell(): write(separator)
+            write(text)
+        elif kind == 'open':
+            depth += 1
+            if skipped < 0 and skip_tags and match.group('tag_name').lower() in skip_tags:
+                skipped = depth
+        else:
+            if depth == skipped: skipped = -1
+            depth -= 1
+
+    return buffer.getvalue()
+
+
+def parse_html_file(path: str, encoding: str = 'utf-8', stats: ParseStats = None):
+    '''
+    Parse HTML file without reading it into a string: the file
+    is memory-mapped and tokenized as bytes, the text is kept
+    as spans of the mapped file (`TextSpan`), which are decoded on access
+    Arguments:
+        `path`: `str`, the file to parse
+        `encoding`: `str`, the encoding of the file (ASCII-compatible)
+        `stats`: `ParseStats` (optional), filled in while parsing
+    Returns:
+        `Tag` object with root of the DOM tree
+    Raises:
+        `RuntimeError` if parsing error is encountered
+    '''
     root = Tag('root')
-    parse_content(root)
+    with open(path, 'rb') as file:
+        # empty files cannot be mapped
+        if not os.fstat(file.fileno()).st_size: return root
+        source = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    make_tag = lambda match: Tag(
+        match.group('tag_name').decode(encoding), match.group('attrs').decode(encoding)
+    )
+    make_text = lambda match: TextSpan(
+        source, match.start(), match.end() - match.start(), encoding
+    )
+    _build_tree(root, source, BYTES_TOKEN_REGEX, make_tag, make_text, stats=stats)
     return root
+
+
+def _iter_chunks(source, chunk_size: int):
+    read = getattr(source, 'read', None)
+    if read is None:
+        yield from source
+        return
+    while True:
+        chunk = read(chunk_size)
+        if not chunk: return
+        yield chunk
+
+
+def iter_stream_events(source, skip_root=False, chunk_size: int = 1 << 16):
+    '''
+    Parse HTML from a file object (or an iterable of string chunks)
+    on the fly, the tag tree is never built. Yields the same events
+    as `Tag.iter_events` of the tree `parse_html` would return
+
+    Only the open tags and their text (which is emitted along with
+    the closing tag) are kept in memory, along with the current chunk
+
+    Arguments:
+        `source`: text file object or iterable of `str` chunks
+        `skip_root`: `bool`, whether to yield the events of the root tag
+        `chunk_size`: `int`, the number of characters to read at once
+    Raises:
+        `RuntimeError` if parsing error is encountered
+    '''
+    if not skip_root: yield OPEN, 'root'
+    # the names of the open tags along with their text pieces
+    stack = [('root', [])]
+    tokenizer = Tokenizer()
+    buffer = ''
+
+    for chunk in _iter_chunks(source, chunk_size):
+        if not isinstance(chunk, str): raise TypeError(f'Expected HTML string chunks')
+        # the tag may be split between the chunks, then
+        # the rest of it is to come with the next chunk
+        buffer = buffer[tokenizer.pos:] + chunk
+
+        for match in tokenizer.tokens(buffer, partial=True):
+            kind = match.lastgroup
+            if kind == 'data':
+                # the text may be split as well, it is joined anyway
+                stack[-1][1].append(match.group())
+            elif kind == 'open':
+                name = match.group('tag_name')
+                yield OPEN, name
+                stack.append((name, []))
+            elif len(stack) > 1:
+                name, text = stack.pop()
+                yield CONTENT, "".join(text)
+                yield CLOSE, name
+
+        if tokenizer.finished: break
+
+    if not tokenizer.finished and tokenizer.pos < len(buffer):
+        raise RuntimeError(f"Parsing Error: {buffer[tokenizer.pos:]}")
+
+    # the tags left open are closed by the end of the document
+    while stack:
+        name, text = stack.pop()
+        if not stack and skip_root: break
+        yield CONTENT, "".join(text)
+        yield CLOSE, name
+
+
+def parse_stream(
+    source, on_open, on_close, on_content, skip_root=False, chunk_size=1 << 16
+):
+    '''
+    Streaming counterpart of `parse_html(...).describe(...)`:
+    the callbacks are triggered as the document is read
+
+    Arguments:
+        `source`: text file object or iterable of `str` chunks
+        `on_open`, `on_close`: callbacks, is called with tag's name as argument
+        `on_content`: callback, is called with the tag's inner plain text as argument
+        `skip_root`: `bool`, whether to trigger callbacks on the root tag
+        `chunk_size`: `int`, the number of characters to read at once
+    '''
+    callbacks = {OPEN: on_open, CONTENT: on_content, CLOSE: on_close}
+    for event, value in iter_stream_events(source, skip_root, chunk_size):
+        callbacks[event](value)
@@ -0,0 +1,245 @@
+"""
+Indexed queries over the tag tree
+
+The tree is walked once to build the indexes (tag name and
+attributes to the tags) and to number the tags in pre-order,
+then the selectors are evaluated against the indexes
+"""
+
+from bisect import bisect_left, bisect_right
+from functools import lru_cache
+import re
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from .parser import Tag
+
+SELECTOR_TOKEN_REGEX = re.compile(
+    r"""(?P<space>\s*)(?:
+        (?P<child>>)
+        | (?P<name>\*|[\w\-!]+)
+        | \.(?P<cls>[\w\-]+)
+        | \#(?P<id>[\w\-]+)
+        | \[\s*(?P<key>[\w\-:@]+)\s*
+          (?:=\s*(?:"(?P<dq>[^"]*)"|'(?P<sq>[^']*)'|(?P<bare>[^\]\s]*)))?\s*\]
+    )""",
+    re.VERBOSE,
+)
+
+# combinators of the selectors
+DESCENDANT, CHILD = " ", ">"
+# the key of the index of all the tags
+ANY = ("*", None)
+
+
+def _index_keys(name: str, attrs: Dict[str, str]):
+    yield ANY
+    yield "name", name
+    for key, value in attrs.items():
+        yield key, None
+        # classes are matched one by one as well
+        values = {value, *value.split()} if key == "class" else (value,)
+        for value in values:
+            yield key, value
+
+
+@lru_cache(maxsize=256)
+def parse_selector(selector: str):
+    '''
+    Parse the selector into the compounds (each is a tuple of the
+    index keys a tag should have) and the combinators between them
+    Raises:
+        `ValueError` if the selector is malformed
+    '''
+    compounds: List[tuple] = []
+    combinators: List[str] = []
+    keys: List[tuple] = []
+    pending: Optional[str] = None
+    pos, end = 0, len(selector.rstrip())
+
+    while pos < end:
+        match = SELECTOR_TOKEN_REGEX.match(selector, pos)
+        if not match: raise ValueError(f"Invalid selector: {selector[pos:]}")
+        pos = match.end()
+
+        if match.group("child"):
+            if not keys or pending == CHILD:
+                raise ValueError(f"Invalid selector: {selector}")
+            pending = CHILD
+            continue
+        # the whitespace between the compounds is the descendant combinator
+        if keys and (pending or match.group("space")):
+            compounds.append(tuple(keys))
+            combinators.append(pending or DESCENDANT)
+            keys, pending = [], None
+
+        if match.group("name"):
+            if keys: raise ValueError(f"Invalid selector: {selector}")
+            name = match.group("name").lower()
+            keys.append(ANY if name == "*" else ("name", name))
+        elif match.group("cls"):
+            keys.append(("class", match.group("cls")))
+        elif match.group("id"):
+            keys.append(("id", match.group("id")))
+        else:
+            value = match.group("dq")
+            if value is None: value = match.group("sq")
+            if value is None: value = match.group("bare")
+            keys.append((match.group("key").lower(), value))
+
+    if not keys or pending: raise ValueError(f"Invalid selector: {selector}")
+    compounds.append(tuple(keys))
+    return tuple(compounds), tuple(combinators)
+
+
+class QueryIndex:
+    '''
+    Indexes of the tag tree, built once to query the tree repeatedly
+
+    The tags are numbered in pre-order, the root is `0`; `last[i]` is
+    the number of the last descendant of the tag `i`, thus the tag `i`
+    is an ancestor of the tag `j` if `i < j <= last[i]`
+
+    Arguments:
+        `root`: `Tag`, the root of the tree (it is not indexed itself)
+    '''
+
+    def __init__(self, root: Tag) -> None:
+        self.tags: List[Tag] = []
+        self.parent: List[int] = []
+        self.last: List[int] = []
+        self.depth: List[int] = []
+        # index key to the numbers of the tags (in ascending order)
+        self.index: Dict[tuple, List[int]] = {}
+        self._sets: Dict[tuple, frozenset] = {}
+
+        stack = [(root, -1)]
+        while stack:
+            tag, parent = stack.pop()
+            number = len(self.tags)
+            self.tags.append(tag)
+            self.parent.append(parent)
+            self.last.append(number)
+            self.depth.append(self.depth[parent] + 1 if parent >= 0 else 0)
+
+            if number:
+                for key in _index_keys(tag.name.lower(), tag.attrs):
+                    self.index.setdefault(key, []).append(number)
+
+            subtags = [child for child in tag.children if isinstance(child, Tag)]
+            stack.extend((subtag, number) for subtag in reversed(subtags))
+
+        # the last descendants are known once the subtrees are numbered
+        for number in range(len(self.tags) - 1, 0, -1):
+            parent = self.parent[number]
+            if self.last[number] > self.last[parent]:
+                self.last[parent] = self.last[number]
+
+    def __len__(self) -> int:
+        return len(self.tags) - 1
+
+    def is_ancestor(self, ancestor: int, number: int) -> bool:
+        return ancestor < number <= self.last[ancestor]
+
+    def by_name(self, name: str) -> List[Tag]:
+        return [self.tags[i] for i in self.index.get(("name", name.lower()), ())]
+
+    def by_attr(self, key: str, value: Optional[str] = None) -> List[Tag]:
+        return [self.tags[i] for i in self.index.get((key.lower(), value), ())]
+
+    def _members(self, key: tuple) -> frozenset:
+        members = self._sets.get(key)
+        if members is None:
+            members = self._sets[key] = frozenset(self.index.get(key, ()))
+        return members
+
+    def _size(self, compound: tuple) -> int:
+        return min(len(self.index.get(key, ())) for key in compound)
+
+    def _candidates(self, compound: tuple, start=0, stop=None) -> Iterator[int]:
+        # the shortest index is scanned (within the range of the numbers
+        # `start < number <= stop`), the rest are looked up
+        keys = sorted(compound, key=lambda key: len(self.index.get(key, ())))
+        others = [self._members(key) for key in keys[1:]]
+        postings = self.index.get(keys[0], ())
+        lo = bisect_right(postings, start)
+        hi = len(postings) if stop is None else bisect_right(postings, stop, lo)
+        for i in range(lo, hi):
+            number = postings[i]
+            if all(number in members for members in others):
+                yield number
+
+    def _scopes(self, compound: tuple) -> Iterator[Tuple[int, int]]:
+        # the ranges of the subtrees of the outermost matching tags
+        stop = 0
+        for number in self._candidates(compound):
+            if number <= stop: continue
+            stop = self.last[number]
+            yield number, stop
+
+    def _matches(self, number: int, compound: tuple) -> bool:
+        return number > 0 and all(number in self._members(key) for key in compound)
+
+    def _matches_up(self, number: int, compounds, combinators, k: int) -> bool:
+        # whether the ancestors of the tag match the compounds before `k`
+        if k < 0: return True
+        compound = compounds[k]
+
+        if combinators[k] == CHILD:
+            parent = self.parent[number]
+            return self._matches(parent, compound) and self._matches_up(
+                parent, compounds, combinators, k - 1
+            )
+
+        # either the ancestors are walked or the preceding candidates
+        # are checked, whichever is shorter
+        postings = min((self.index.get(key, ()) for key in compound), key=len)
+        preceding = bisect_left(postings, number)
+        if preceding <= self.depth[number]:
+            for i in range(preceding - 1, -1, -1):
+                ancestor = postings[i]
+                if (
+                    self.is_ancestor(ancestor, number)
+                    and self._matches(ancestor, compound)
+                    and self._matches_up(ancestor, compounds, combinators, k - 1)
+                ):
+                    return True
+            return False
+
+        ancestor = self.parent[number]
+        while ancestor > 0:
+            if self._matches(ancestor, compound) and self._matches_up(
+                ancestor, compounds, combinators, k - 1
+            ):
+                return True
+            ancestor = self.parent[ancestor]
+        return False
+
+    def select(self, selector: str) -> Iterator[Tag]:
+        '''
+        Lazily yield the tags matching the selector, in document order
+
+        The selector is a sequence of compounds separated by
+        the descendant (whitespace) or child (`>`) combinators,
+        each compound is a tag name (or `*`) followed by any
+        of `.class`, `#id`, `[attr]` and `[attr=value]`,
+        e.g. `div.block > p a[href]`
+
+        Raises:
+            `ValueError` if the selector is malformed
+        '''
+        compounds, combinators = parse_selector(selector)
+        if not combinators:
+            yield from map(self.tags.__getitem__, self._candidates(compounds[0]))
+            return
+
+        # the matching tags are descendants of the tags matching any of
+        # the compounds on the left, thus only the subtrees of the most
+        # selective one are searched, then the candidates are checked
+        scope = min(compounds[:-1], key=self._size)
+        for start, stop in self._scopes(scope):
+            for number in self._candidates(compounds[-1], start, stop):
+                if self._matches_up(number, compounds, combinators, len(combinators) - 1):
+                    yield self.tags[number]
+
+    def select_one(self, selector: str) -> Optional[Tag]:
+        return next(self.select(selector), None)
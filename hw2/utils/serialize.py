@@ -0,0 +1,172 @@
+"""
+Compact binary format of the tag tree
+
+The tree is written by columns of `CompactTree`: the header is
+followed by the table of the tag names, the fixed-width node
+records and the blob of the text (UTF-8), the records refer
+to the names and the text by their indices and offsets.
+The files are loaded by mapping them into memory (see `load`)
+"""
+
+from array import array
+import mmap
+import os
+import struct
+import sys
+from typing import Union
+
+from .dom import CompactTree, from_tag
+from .parser import Tag
+
+MAGIC = b"HTMT"
+VERSION = 1
+# magic, version, the number of nodes, the sizes of names table and text blob
+HEADER = struct.Struct("<4sBxxxIII")
+# parent, first child, next sibling, kind, name id, text start
+# and text length, all of them are little-endian int32
+FIELDS = 7
+RECORD_SIZE = FIELDS * 4
+NAMES_DELIM = b"\0"
+ENCODING = "utf-8"
+
+
+def _align(offset: int, size: int = 8) -> int:
+    return -(-offset // size) * size
+
+
+def dumps(tree: Union[CompactTree, Tag]) -> bytes:
+    """
+    Serialize the tree (`Tag` trees are converted to `CompactTree` first),
+    only the text the nodes refer to is kept
+    """
+    if isinstance(tree, Tag): tree = from_tag(tree)
+    size = len(tree)
+
+    # the spans are moved into the new blob
+    pieces, start, length = [], array("i", bytes(4 * size)), array("i", bytes(4 * size))
+    offset = 0
+    for node in range(size):
+        if not tree.length[node]: continue
+        text = tree.text(node).encode(ENCODING)
+        pieces.append(text)
+        start[node], length[node] = offset, len(text)
+        offset += len(text)
+    text = b"".join(pieces)
+
+    records = array("i", bytes(RECORD_SIZE * size))
+    columns = (
+        tree.parent,
+        tree.first_child,
+        tree.next_sibling,
+        tree.kind,
+        tree.name_id,
+        start,
+        length,
+    )
+    for field, column in enumerate(columns):
+        records[field::FIELDS] = array("i", column)
+    if sys.byteorder == "big": records.byteswap()
+
+    names = NAMES_DELIM.join(name.encode(ENCODING) for name in tree.names)
+    header = HEADER.pack(MAGIC, VERSION, size, len(names), len(text))
+    padding = bytes(_align(len(header) + len(names)) - len(header) - len(names))
+    return b"".join((header, names, padding, records.tobytes(), text))
+
+
+def dump(tree: Union[CompactTree, Tag], path: str) -> None:
+    with open(path, "wb") as file:
+        file.write(dumps(tree))
+
+
+def _unpack(view: memoryview):
+    # the names, the text and the columns, along with the views made
+    if len(view) < HEADER.size:
+        raise ValueError("Not a serialized tag tree: the data is truncated")
+    magic, version, size, names_size, text_size = HEADER.unpack_from(view)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("Not a serialized tag tree")
+
+    offset = HEADER.size
+    names = bytes(view[offset : offset + names_size]).decode(ENCODING)
+    offset = _align(offset + names_size)
+    end = offset + RECORD_SIZE * size
+    if len(view) < end + text_size:
+        raise ValueError("Not a serialized tag tree: the data is truncated")
+
+    views = []
+    if sys.byteorder == "little":
+        views.append(view[offset:end])
+        records = views[-1].cast("i")
+        views.append(records)
+    else:
+        records = array("i")
+        records.frombytes(view[offset:end])
+        records.byteswap()
+    columns = [records[field::FIELDS] for field in range(FIELDS)]
+    source = view[end : end + text_size]
+    views.extend(column for column in columns if isinstance(column, memoryview))
+    views.append(source)
+
+    names = names.split(NAMES_DELIM.decode(ENCODING)) if names_size else []
+    return names, source, columns, views
+
+
+def loads(data) -> CompactTree:
+    """
+    Load the tree from the bytes-like object, the columns and the text
+    are views of `data` (no copies are made on little-endian machines)
+    Raises:
+        `ValueError` if the data is not a serialized tree
+    """
+    names, source, columns, _ = _unpack(memoryview(data))
+    return CompactTree(names, source, *columns, ENCODING)
+
+
+class MappedTree(CompactTree):
+    """
+    The tree backed by the memory-mapped file: nothing but the names
+    is read on loading, the nodes are read as the tree is walked
+    (e.g. by `tree.root.describe(...)`), no `Tag` objects are made
+
+    Arguments:
+        `path`: `str`, the file written by `dump`
+    Raises:
+        `ValueError` if the file is not a serialized tree
+    """
+
+    def __init__(self, path: str) -> None:
+        with open(path, "rb") as file:
+            # empty files cannot be mapped
+            if not os.fstat(file.fileno()).st_size:
+                raise ValueError(f"Not a serialized tag tree: {path}")
+            self.buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        view = memoryview(self.buffer)
+        try:
+            names, source, columns, views = _unpack(view)
+        except ValueError:
+            view.release()
+            self.buffer.close()
+            raise
+        self._views = [view, *views]
+        super().__init__(names, source, *columns, ENCODING)
+
+    def __enter__(self) -> "MappedTree":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        '''
+        Unmap the file, the tree cannot be used afterwards
+        '''
+        # the views are released before the map they refer to
+        for view in reversed(self._views):
+            view.release()
+        self._views = []
+        self.buffer.close()
+
+
+def load(path: str) -> MappedTree:
+    return MappedTree(path)
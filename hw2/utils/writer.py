@@ -0,0 +1,89 @@
+"""
+Serializer of the tag tree back to HTML
+
+The tree is walked with an explicit stack, the pieces of HTML are
+collected into a list and joined (or encoded and written) in large chunks
+"""
+
+from typing import BinaryIO, Iterator, List
+
+from .parser import Tag
+
+
+def _open_tag(tag: Tag) -> str:
+    return f"<{tag.name}{tag.raw_attrs}>"
+
+
+def iter_html(root: Tag, pretty=False, indent: str = "  ", skip_root=True) -> Iterator[str]:
+    '''
+    Lazily yield the pieces of HTML of the tree, each tag is closed
+
+    Arguments:
+        `pretty`: `bool`, whether to put each tag and text on its own line
+            (the text is stripped, the whitespace-only text is dropped)
+        `indent`: `str`, the indentation of a nesting level (if `pretty`)
+        `skip_root`: `bool`, whether to write the children of the root only
+            (the root made by the parser is not a part of the document)
+    '''
+    if not skip_root: yield _open_tag(root) + ("\n" if pretty else "")
+    depth = 0 if skip_root else 1
+    # each entry is a tag along with the iterator
+    # over its children which are not written yet
+    stack = [(root, iter(root.children))]
+    while stack:
+        tag, children = stack[-1]
+        for child in children:
+            if isinstance(child, Tag):
+                if pretty: yield indent * depth
+                yield _open_tag(child)
+                if pretty: yield "\n"
+                depth += 1
+                stack.append((child, iter(child.children)))
+                break
+            text = str(child)
+            if not pretty:
+                yield text
+            elif text and not text.isspace():
+                yield f"{indent * depth}{text.strip()}\n"
+        else:
+            stack.pop()
+            if tag is root and skip_root: continue
+            depth -= 1
+            if pretty: yield indent * depth
+            yield f"</{tag.name}>\n" if pretty else f"</{tag.name}>"
+
+
+def to_html(root: Tag, pretty=False, indent: str = "  ", skip_root=True) -> str:
+    '''
+    Serialize the tree into a string, see `iter_html` for the arguments
+    '''
+    return "".join(iter_html(root, pretty, indent, skip_root))
+
+
+def write_to(
+    root: Tag,
+    fileobj: BinaryIO,
+    pretty=False,
+    indent: str = "  ",
+    skip_root=True,
+    encoding: str = "utf-8",
+    chunk_size: int = 1 << 16,
+) -> int:
+    '''
+    Serialize the tree into the binary stream, the pieces are written
+    in chunks of about `chunk_size` characters, see `iter_html`
+    for the rest of the arguments
+    Returns:
+        `int`, the number of bytes written
+    '''
+    written, size = 0, 0
+    pieces: List[str] = []
+    for piece in iter_html(root, pretty, indent, skip_root):
+        pieces.append(piece)
+        size += len(piece)
+        if size >= chunk_size:
+            written += fileobj.write("".join(pieces).encode(encoding))
+            pieces.clear()
+            size = 0
+    if pieces: written += fileobj.write("".join(pieces).encode(encoding))
+    return written
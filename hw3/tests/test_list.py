@@ -1,3 +1,5 @@
+import copy
+import pickle
 from typing import Callable, Iterable, List
 
 import pytest
@@ -209,3 +211,99 @@ def test_inner_values(a, b, assert_elementwise_equal):
     assert_elementwise_equal(b_shiny - a, elementwise_sub(b_shiny, a))
     assert_elementwise_equal(b - a_shiny, elementwise_sub(b, a_shiny))
     assert_elementwise_equal(a_shiny - b, elementwise_sub(a_shiny, b))
+
+
+def test_cached_sum(sample_data: List[int], faker: Faker):
+    # the sum is kept up to date by the mutating methods
+    shiny = MyShinyList(sample_data)
+
+    def check():
+        assert MyShinyList.sum_key(shiny) == sum(shiny)
+        assert str(shiny) == str(list(shiny)) + f" (cumsum: {sum(shiny)})"
+
+    check()
+    shiny.append(faker.random_int())
+    check()
+    shiny.extend(faker.random_int() for _ in range(3))
+    check()
+    shiny.insert(2, faker.random_int())
+    check()
+    shiny.pop()
+    shiny.pop(0)
+    check()
+    shiny.remove(shiny[3])
+    check()
+    shiny[1] = faker.random_int()
+    shiny[-1] = faker.random_int()
+    check()
+    shiny[2:5] = (faker.random_int() for _ in range(5))
+    shiny[::2] = [0] * len(shiny[::2])
+    check()
+    with pytest.raises(ValueError):
+        shiny[::2] = [1]
+    check()
+    del shiny[0]
+    del shiny[1:4]
+    check()
+    shiny += [faker.random_int() for _ in range(2)]
+    assert isinstance(shiny, MyShinyList)
+    check()
+    shiny *= 3
+    check()
+    shiny.sort()
+    shiny.reverse()
+    check()
+    shiny *= 0
+    check()
+    shiny.extend(sample_data)
+    shiny.clear()
+    check()
+
+
+def test_copies(sample_data: List[int]):
+    shiny = MyShinyList(sample_data)
+    for other in (
+        copy.copy(shiny),
+        copy.deepcopy(shiny),
+        pickle.loads(pickle.dumps(shiny)),
+    ):
+        assert isinstance(other, MyShinyList)
+        assert list(other) == sample_data
+        assert MyShinyList.sum_key(other) == sum(sample_data)
+        other.append(1)
+        assert MyShinyList.sum_key(shiny) == sum(sample_data)
+
+
+def test_sum_key(faker: Faker):
+    lists = [
+        MyShinyList(faker.random_int(-100, 100) for _ in range(faker.random_int(0, 5)))
+        for _ in range(SEQUENCE_LENGTH)
+    ]
+    plain = [faker.random_int(-100, 100) for _ in range(3)]
+    ordered = sorted(lists + [plain], key=MyShinyList.sum_key)
+    sums = [sum(x) for x in ordered]
+    assert sums == sorted(sums)
+    assert [sum(x) for x in sorted(lists)] == sorted(sum(x) for x in lists)
+
+
+def test_cached_sum_floats(faker: Faker):
+    # adding and subtracting floats would lose the small items
+    shiny = MyShinyList([1e16])
+    shiny.append(1.0)
+    shiny.pop(0)
+    assert MyShinyList.sum_key(shiny) == sum(shiny) == 1.0
+    assert shiny == [1.0] and shiny > [0.5]
+
+    shiny = MyShinyList([faker.pyfloat() for _ in range(SEQUENCE_LENGTH)])
+    shiny.extend([1e16, -1e16, 0.1])
+    del shiny[:3]
+    shiny[0] = 1
+    shiny.remove(1e16)
+    assert MyShinyList.sum_key(shiny) == sum(shiny)
+
+    # integers keep the sum exact
+    shiny = MyShinyList([10 ** 20, 1])
+    shiny.append(0.5)
+    shiny.pop()
+    shiny.pop(0)
+    assert MyShinyList.sum_key(shiny) == 1
@@ -1,6 +1,6 @@
 from copy import deepcopy
 from functools import reduce
-from typing import List, Tuple, Union
+from typing import Iterable, List, Tuple, Union
 
 SupportsList = Union[List, "MyShinyList"]
 
@@ -8,10 +8,91 @@ __all__ = ["MyShinyList"]
 
 
 class MyShinyList(list):
+    # the sum of the items is cached, the mutating methods keep it up to date
+    # while it is exact (integers), otherwise (e.g. floats, where adding and
+    # subtracting would pile up rounding errors) it is summed again when needed
+    def __init__(self, iterable: Iterable = ()) -> None:
+        super().__init__(iterable)
+        self._sum = None
+
     @staticmethod
     def _cumsum(list_instance: SupportsList) -> int:
         return reduce(lambda x, y: x + y, list_instance, 0)
 
+    @property
+    def _total(self) -> int:
+        if self._sum is None: self._sum = self._cumsum(self)
+        return self._sum
+
+    def _update(self, added: Iterable = (), removed: Iterable = ()) -> None:
+        exact = lambda items: all(isinstance(x, int) for x in items)
+        if isinstance(self._sum, int) and exact(added) and exact(removed):
+            self._sum += sum(added) - sum(removed)
+        else:
+            self._sum = None
+
+    @staticmethod
+    def sum_key(list_instance: SupportsList) -> int:
+        # sort key, e.g. sorted(lists, key=MyShinyList.sum_key)
+        if isinstance(list_instance, MyShinyList):
+            return list_instance._total
+        return MyShinyList._cumsum(list_instance)
+
+    def __reduce__(self):
+        # copies and pickles are built with __init__, otherwise the items
+        # would be appended to the instance with the sum already restored
+        return self.__class__, (list(self),)
+
+    def append(self, item) -> None:
+        super().append(item)
+        self._update((item,))
+
+    def extend(self, iterable: Iterable) -> None:
+        items = list(iterable)
+        super().extend(items)
+        self._update(items)
+
+    def insert(self, index: int, item) -> None:
+        super().insert(index, item)
+        self._update((item,))
+
+    def pop(self, index: int = -1):
+        item = super().pop(index)
+        self._update(removed=(item,))
+        return item
+
+    def remove(self, item) -> None:
+        self.pop(self.index(item))
+
+    def clear(self) -> None:
+        super().clear()
+        self._sum = 0
+
+    def __setitem__(self, key, value) -> None:
+        old = self[key]
+        if isinstance(key, slice):
+            value = list(value)
+            super().__setitem__(key, value)
+            self._update(value, old)
+            return
+        super().__setitem__(key, value)
+        self._update((value,), (old,))
+
+    def __delitem__(self, key) -> None:
+        old = self[key]
+        super().__delitem__(key)
+        self._update(removed=old if isinstance(key, slice) else (old,))
+
+    def __iadd__(self, other: Iterable) -> "MyShinyList":
+        self.extend(other)
+        return self
+
+    def __imul__(self, times: int) -> "MyShinyList":
+        super().__imul__(times)
+        if isinstance(self._sum, int): self._sum = self._sum * times if times > 0 else 0
+        else: self._sum = None
+        return self
+
     def _zero_pad_sequence(self, other: SupportsList) -> Tuple[list, list]:
         copy_self = deepcopy(self)
         copy_other = deepcopy(other)
@@ -42,22 +123,22 @@ class MyShinyList(list):
         return MyShinyList((x - y for x, y in zip(copy_other, copy_self)))
 
     def __str__(self) -> str:
-        return super().__str__() + f" (cumsum: {self._cumsum(self)})"
+        return super().__str__() + f" (cumsum: {self._total})"
 
     def __le__(self, other: SupportsList) -> bool:
-        return self._cumsum(self) - self._cumsum(other) <= 0
+        return self._total - self.sum_key(other) <= 0
 
     def __lt__(self, other: SupportsList) -> bool:
-        return self._cumsum(self) - self._cumsum(other) < 0
+        return self._total - self.sum_key(other) < 0
 
     def __ge__(self, other: SupportsList) -> bool:
-        return self._cumsum(self) - self._cumsum(other) >= 0
+        return self._total - self.sum_key(other) >= 0
 
     def __gt__(self, other: SupportsList) -> bool:
-        return self._cumsum(self) - self._cumsum(other) > 0
+        return self._total - self.sum_key(other) > 0
 
     def __eq__(self, other: SupportsList) -> bool:
-        return self._cumsum(self) - self._cumsum(other) == 0
+        return self._total - self.sum_key(other) == 0
 
     def __ne__(self, other: SupportsList) -> bool:
-        return self._cumsum(self) - self._cumsum(other) != 0
+        return self._total - self.sum_key(other) != 0